@@ -10,6 +10,8 @@ from flask import Flask, jsonify
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
 from middleware.activity_logger import init_activity_logging  
+from middleware.compression import init_compression
+from core.json_provider import OrjsonProvider
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -22,6 +24,7 @@ migrate = Migrate()
 def create_app():
     """Application factory pattern"""
     app = Flask(__name__)
+    app.json = OrjsonProvider(app)
     
     # Configuration
     app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'dev-secret-key-change-in-production')
@@ -32,17 +35,29 @@ def create_app():
     # Initialize extensions with app
     db.init_app(app)
     init_activity_logging(app)  
+    init_compression(app)
     migrate.init_app(app, db)
     
+    # Flag lazy-load N+1 query patterns during development
+    if os.getenv('ENABLE_NPLUSONE', '0') == '1':
+        from nplusone.ext.flask_sqlalchemy import NPlusOne
+        NPlusOne(app)
+    
     # Import models to register with SQLAlchemy
     with app.app_context():
-        from models import user, category, product, sale, retailer_metrics, product_log
+        from models import user, category, product, sale, sale_item, retailer_metrics, product_log
         
-        # Create all tables if they don't exist
-        db.create_all()
+        # Production deployments manage the schema with Flask-Migrate and set
+        # SEED_ON_STARTUP=0 so every worker fork skips this work
+        if os.getenv('SEED_ON_STARTUP', '1') == '1':
+            # Create all tables if they don't exist
+            db.create_all()
+            
+            # Seed initial data if tables are empty
+            _seed_initial_data()
         
-        # Seed initial data if tables are empty
-        _seed_initial_data()
+        _check_schema(app)
+        _migrate_log_source(app)
     
     # Register blueprints
     from routes.users import bp as users_bp
@@ -81,15 +96,84 @@ def create_app():
     return app
 
 
+def _check_schema(app):
+    """
+    Warn about tables created before a model-level schema change
+    db.create_all() never alters existing tables, so these need a manual migration
+    """
+    from sqlalchemy import inspect
+    
+    inspector = inspect(db.engine)
+    if not inspector.has_table('sale_items'):
+        return
+    
+    # sale_items.product_id must be nullable with ON DELETE SET NULL, or
+    # deleting a product that has been sold fails on FK-enforcing databases
+    product_fks = [fk for fk in inspector.get_foreign_keys('sale_items') if fk.get('referred_table') == 'products']
+    nullable = {col['name']: col['nullable'] for col in inspector.get_columns('sale_items')}.get('product_id', True)
+    ondelete = [(fk.get('options') or {}).get('ondelete') for fk in product_fks]
+    if not nullable or any((rule or '').upper() != 'SET NULL' for rule in ondelete):
+        app.logger.warning(
+            "sale_items.product_id predates ON DELETE SET NULL; recreate the foreign key "
+            "(and drop NOT NULL) or product deletes will fail for products that have been sold"
+        )
+
+
+def _migrate_log_source(app):
+    """
+    Bring product_logs from before the source column up to date: add the
+    column and its index, then backfill it from the "source" key of the notes
+    JSON. Once done, later starts find nothing left to fill
+    """
+    import orjson
+    from sqlalchemy import inspect, select, text, update
+    from models.product_log import ProductLog
+    
+    inspector = inspect(db.engine)
+    if not inspector.has_table('product_logs'):
+        return
+    
+    try:
+        if 'source' not in {col['name'] for col in inspector.get_columns('product_logs')}:
+            app.logger.info("Adding product_logs.source")
+            db.session.execute(text("ALTER TABLE product_logs ADD COLUMN source VARCHAR(16)"))
+            db.session.commit()
+            for index in ProductLog.__table__.indexes:
+                if index.name == 'ix_log_source_time':
+                    index.create(db.engine, checkfirst=True)
+        
+        # Only rows the old notes LIKE filter could have matched carry a source
+        rows = db.session.execute(
+            select(ProductLog.id, ProductLog.notes)
+            .where(ProductLog.source.is_(None), ProductLog.notes.like('%"source"%'))
+        ).all()
+        updates = []
+        for log_id, notes in rows:
+            try:
+                source = orjson.loads(notes).get('source')
+            except (orjson.JSONDecodeError, AttributeError):
+                continue
+            if isinstance(source, str) and source:
+                updates.append({'id': log_id, 'source': source[:16]})
+        if updates:
+            db.session.execute(update(ProductLog), updates)
+            db.session.commit()
+            app.logger.info("Backfilled source on %d product_logs rows", len(updates))
+    except Exception:
+        # Another worker may be migrating concurrently; the next start retries
+        db.session.rollback()
+        app.logger.exception("product_logs.source migration failed")
+
+
 def _seed_initial_data():
     """Seed initial data if database is empty"""
     from models.user import User
     from models.category import Category
     from models.retailer_metrics import RetailerMetrics
-    import hashlib
+    from core.user_manager import hash_password
     
-    # Check if users exist
-    if User.query.count() == 0:
+    # Check if users exist (EXISTS stops at the first row, unlike COUNT)
+    if not db.session.query(User.query.exists()).scalar():
         print("Seeding initial users...")
         
         # Create default users (passwords hashed with SHA256)
@@ -114,34 +198,37 @@ def _seed_initial_data():
             }
         ]
         
-        for user_data in users_data:
-            password_hash = hashlib.sha256(user_data['password'].encode()).hexdigest()
-            user = User(
-                username=user_data['username'],
-                password_hash=password_hash,
-                role=user_data['role'],
-                email=user_data.get('email')
+        # Hash every password up front so hashing and DB work don't interleave
+        password_hashes = [hash_password(user_data['password']) for user_data in users_data]
+        
+        # Single multi-row INSERT; User has no email column, so it is not sent
+        users_rows = [
+            {
+                'username': user_data['username'],
+                'password_hash': password_hash,
+                'role': user_data['role']
+            }
+            for user_data, password_hash in zip(users_data, password_hashes)
+        ]
+        db.session.execute(User.__table__.insert(), users_rows)
+        
+        # Create metrics for retailers
+        retailer_ids = [uid for (uid,) in db.session.query(User.id).filter(User.role == 'Retailer')]
+        if retailer_ids:
+            db.session.execute(
+                RetailerMetrics.__table__.insert(),
+                [{'retailer_id': uid} for uid in retailer_ids]
             )
-            db.session.add(user)
-            
-            # Create metrics for retailers
-            if user_data['role'] == 'Retailer':
-                db.session.flush()  # Get user.id
-                metrics = RetailerMetrics(retailer_id=user.id)
-                db.session.add(metrics)
         
         db.session.commit()
         print(f"Created {len(users_data)} default users")
     
     # Check if categories exist
-    if Category.query.count() == 0:
+    if not db.session.query(Category.query.exists()).scalar():
         print("Seeding initial categories...")
         categories = ["Meat", "Seafood", "Pantry Items", "Junk Food", "Pet Food (Wet & Dry)"]
         
-        for cat_name in categories:
-            category = Category(name=cat_name)
-            db.session.add(category)
-        
+        db.session.execute(Category.__table__.insert(), [{'name': name} for name in categories])
         db.session.commit()
         print(f"Created {len(categories)} categories")
 
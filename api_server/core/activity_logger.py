@@ -7,7 +7,7 @@ from app import db
 from models.product_log import ProductLog  
 from datetime import datetime  
 from typing import Optional, Dict  
-import json  
+import orjson  
   
   
 class ActivityLogger:  
@@ -22,7 +22,8 @@ class ActivityLogger:
         user_id: Optional[int],  
         action_type: str,  
         notes: Optional[str] = None,  
-        source: str = "Desktop App"  
+        source: str = "Desktop App",  
+        log_time: Optional[datetime] = None  
     ) -> ProductLog:  
         """  
         Log product-related actions (Restock, Sale, Dispose)  
@@ -33,6 +34,7 @@ class ActivityLogger:
             action_type: Type of action (Restock, Sale, Dispose)  
             notes: Additional notes about the action  
             source: Source of the action ("Desktop App" or "API")  
+            log_time: When the action happened (defaults to now)  
           
         Returns:  
             ProductLog instance (not committed)  
@@ -42,7 +44,8 @@ class ActivityLogger:
             user_id=user_id,  
             action_type=action_type,  
             notes=notes or f"Action performed via {source}",  
-            log_time=datetime.utcnow()  
+            source=source,  
+            log_time=log_time or datetime.utcnow()  
         )  
         db.session.add(log)  
         return log  
@@ -54,7 +57,8 @@ class ActivityLogger:
         target: str,  
         details: Optional[Dict] = None,  
         source: str = "Desktop App",  
-        ip_address: Optional[str] = None  
+        ip_address: Optional[str] = None,  
+        log_time: Optional[datetime] = None  
     ) -> ProductLog:  
         """  
         Log general user actions (login, user management, category management)  
@@ -67,6 +71,7 @@ class ActivityLogger:
             details: Additional details as dictionary  
             source: Source of the action ("Desktop App" or "API")  
             ip_address: IP address for API calls  
+            log_time: When the action happened (defaults to now)  
           
         Returns:  
             ProductLog instance (not committed)  
@@ -85,8 +90,9 @@ class ActivityLogger:
             product_id=None,  # NULL for non-product actions  
             user_id=user_id,  
             action_type=action,  
-            notes=json.dumps(notes_dict),  
-            log_time=datetime.utcnow()  
+            notes=orjson.dumps(notes_dict, option=orjson.OPT_NON_STR_KEYS).decode(),  
+            source=source,  
+            log_time=log_time or datetime.utcnow()  
         )  
         db.session.add(log)  
         return log  
@@ -98,7 +104,8 @@ class ActivityLogger:
         target_entity: Optional[str] = None,  
         target_id: Optional[int] = None,  
         ip_address: Optional[str] = None,  
-        user_id: Optional[int] = None  
+        user_id: Optional[int] = None,  
+        log_time: Optional[datetime] = None  
     ) -> ProductLog:  
         """  
         Log direct API operations (Postman/ThunderClient calls)  
@@ -110,6 +117,7 @@ class ActivityLogger:
             target_id: ID of the affected entity  
             ip_address: IP address of the caller  
             user_id: User ID if authenticated (None for open API)  
+            log_time: When the request happened (defaults to now)  
           
         Returns:  
             ProductLog instance (not committed)  
@@ -132,8 +140,9 @@ class ActivityLogger:
             product_id=None,  
             user_id=user_id,  
             action_type=action_type,  
-            notes=json.dumps(notes_dict),  
-            log_time=datetime.utcnow()  
+            notes=orjson.dumps(notes_dict, option=orjson.OPT_NON_STR_KEYS).decode(),  
+            source="API",  
+            log_time=log_time or datetime.utcnow()  
         )  
         db.session.add(log)  
         return log  
@@ -166,7 +175,7 @@ class ActivityLogger:
             query = query.filter(ProductLog.action_type == action_type)  
           
         if source:  
-            # Filter by source in notes JSON  
-            query = query.filter(ProductLog.notes.like(f'%"source": "{source}"%'))  
+            # Indexed column (ix_log_source_time) instead of scanning notes JSON  
+            query = query.filter(ProductLog.source == source)  
           
         return query.order_by(ProductLog.log_time.desc()).limit(limit).all()
@@ -0,0 +1,45 @@
+# api_server/core/dashboard_cache.py
+import threading
+import time
+
+
+class DashboardCache:
+    """
+    Short-TTL, in-process cache for dashboard aggregates.
+    Entries expire after TTL_SECONDS and are dropped early by invalidate()
+    from the write paths that change the underlying counts.
+    """
+    TTL_SECONDS = 30
+
+    ADMIN_KEY = 'dash:admin'
+    MANAGER_KEY = 'dash:manager'
+
+    _entries = {}  # {key: (expires_at, payload)}
+    _lock = threading.Lock()
+
+    @staticmethod
+    def retailer_key(user_id):
+        return f'dash:retailer:{user_id}'
+
+    @classmethod
+    def get_or_compute(cls, key, compute, ttl=None):
+        """Return the cached payload for key, calling compute() on a miss"""
+        now = time.monotonic()
+        with cls._lock:
+            entry = cls._entries.get(key)
+        if entry and entry[0] > now:
+            return entry[1]
+
+        payload = compute()
+        with cls._lock:
+            cls._entries[key] = (now + (ttl or cls.TTL_SECONDS), payload)
+        return payload
+
+    @classmethod
+    def invalidate(cls, *keys):
+        """Drop the given keys, or every entry when called without arguments"""
+        with cls._lock:
+            if not keys:
+                cls._entries.clear()
+            for key in keys:
+                cls._entries.pop(key, None)
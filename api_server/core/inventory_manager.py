@@ -1,17 +1,39 @@
 # api_server/core/inventory_manager.py
+import re
 from app import db
+from sqlalchemy import func, or_, select
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy.orm import selectinload
 from models.product import Product
 from core.activity_logger import ActivityLogger
+from core.dashboard_cache import DashboardCache
 from datetime import date, timedelta
 
 class InventoryManager:
     @staticmethod
-    def get_products(category_id=None, search=None):
-        q = Product.query
+    def name_search_filter(search):
+        """
+        Case-insensitive match on Product.name.
+        Postgres serves the ILIKE from the trigram index; MySQL cannot index a leading
+        wildcard, so it gets a prefix search against the FULLTEXT index instead.
+        """
+        if db.engine.dialect.name == 'mysql':
+            terms = re.findall(r'\w+', search)
+            if terms:
+                return match(Product.name, against=' '.join(f'+{t}*' for t in terms)).in_boolean_mode()
+        escaped = search.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        return Product.name.ilike(f"%{escaped}%", escape='\\')
+
+    @staticmethod
+    def get_products(category_id=None, search=None, limit=None, offset=None):
+        """Matching products; pass limit/offset to fetch one page"""
+        q = Product.query.options(selectinload(Product.category))
         if category_id:
             q = q.filter(Product.category_id == category_id)
         if search:
-            q = q.filter(Product.name.ilike(f"%{search}%"))
+            q = q.filter(InventoryManager.name_search_filter(search))
+        if limit is not None:
+            q = q.order_by(Product.id).limit(limit).offset(offset or 0)
         return q.all()
 
     @staticmethod
@@ -22,6 +44,7 @@ class InventoryManager:
         product.stock_level = (product.stock_level or 0) + delta
         ActivityLogger.log_product_action(product_id, acting_user_id or 0, action_type, notes)
         db.session.commit()
+        DashboardCache.invalidate(DashboardCache.MANAGER_KEY)
         return True, None
 
     @staticmethod
@@ -33,3 +56,65 @@ class InventoryManager:
         today = date.today()
         limit = today + timedelta(days=days)
         return Product.query.filter(Product.expiration_date.isnot(None), Product.expiration_date <= limit).all()
+
+    @staticmethod
+    def stock_filters(low_stock=False, max_stock=None, out_of_stock=False,
+                      expiring_days=None, expired=False):
+        """SQL criteria for the stock/expiry views the desktop client asks for"""
+        today = date.today()
+        criteria = []
+        if low_stock:
+            criteria.append(Product.stock_level < Product.min_stock_level)
+        if max_stock is not None:
+            criteria.append(Product.stock_level <= max_stock)
+        if out_of_stock:
+            criteria.append(Product.stock_level == 0)
+        if expiring_days is not None:
+            criteria.append(Product.expiration_date.between(today, today + timedelta(days=expiring_days)))
+        if expired:
+            criteria.append(Product.expiration_date < today)
+        return criteria
+
+    @staticmethod
+    def get_inventory_value():
+        """Total stock value and product count in one aggregate query"""
+        total_value, product_count = db.session.query(
+            func.coalesce(func.sum(Product.price * Product.stock_level), 0),
+            func.count(Product.id)
+        ).one()
+        return float(total_value), product_count
+
+    @staticmethod
+    def get_overview(expiring_days=7):
+        """
+        All dashboard stock views from one scan: every product that is low, out of
+        stock, expiring or expired is read once and sorted into its buckets
+        """
+        today = date.today()
+        horizon = today + timedelta(days=expiring_days)
+        overview = {'low_stock': [], 'out_of_stock': [], 'expiring_soon': [], 'expired': []}
+
+        rows = db.session.execute(
+            select(*Product.summary_columns())
+            .where(or_(
+                Product.stock_level < Product.min_stock_level,
+                Product.stock_level == 0,
+                Product.expiration_date <= horizon
+            ))
+            .order_by(Product.id)
+        )
+        for row in rows:
+            d = Product.row_to_dict(row)
+            if row.stock_level < row.min_stock_level:
+                overview['low_stock'].append(d)
+            if row.stock_level == 0:
+                overview['out_of_stock'].append(d)
+            if row.expiration_date is not None:
+                if row.expiration_date < today:
+                    overview['expired'].append(d)
+                elif row.expiration_date <= horizon:
+                    overview['expiring_soon'].append(d)
+
+        total_value, product_count = InventoryManager.get_inventory_value()
+        overview['inventory_value'] = {'total_value': total_value, 'product_count': product_count}
+        return overview
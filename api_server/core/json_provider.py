@@ -0,0 +1,35 @@
+# api_server/core/json_provider.py
+"""
+orjson-backed JSON provider for Flask
+Routes every jsonify()/request.get_json() call through orjson
+"""
+
+import base64
+from datetime import date, datetime
+from decimal import Decimal
+
+import orjson
+from flask.json.provider import DefaultJSONProvider
+
+_ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS
+
+
+def _default(obj):
+    """Fallback for types orjson does not handle natively"""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, (date, datetime)):
+        return obj.isoformat()
+    if isinstance(obj, (bytes, bytearray, memoryview)):
+        return base64.b64encode(bytes(obj)).decode('ascii')
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Drop-in replacement for Flask's default JSON provider"""
+
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(obj, option=_ORJSON_OPTIONS, default=_default).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
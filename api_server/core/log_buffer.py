@@ -0,0 +1,171 @@
+# api_server/core/log_buffer.py
+"""
+Write-behind buffer for activity log rows
+Callers enqueue ActivityLogger calls; a background worker replays them in
+batches so many log rows share one transaction (and one commit/fsync).
+"""
+
+import atexit
+import os
+import queue
+import threading
+import time
+
+from app import db
+from core.activity_logger import ActivityLogger
+
+# Flush when this many entries are pending or after this many seconds
+BATCH_SIZE = 500
+FLUSH_INTERVAL = 1.0
+# Entries held while the database is slow or down; further entries are dropped
+MAX_PENDING = 10000
+# How long shutdown waits for the writer to finish its in-flight batch
+SHUTDOWN_TIMEOUT = 10.0
+
+# ActivityLogger helper each entry kind is replayed through
+_WRITERS = {
+    'api': ActivityLogger.log_api_operation,
+    'user': ActivityLogger.log_user_action,
+    'product': ActivityLogger.log_product_action,
+}
+
+# Pending (kind, kwargs) entries; _STOP tells the writer to finish and exit
+_queue: "queue.Queue[tuple]" = queue.Queue(maxsize=MAX_PENDING)
+_STOP = None
+_start_lock = threading.Lock()
+# PID the writer thread was started in; a forked child has no writer of its own
+_started_pid = None
+_app = None
+_worker_thread = None
+# Entries dropped on a full queue since the last report
+_dropped = 0
+
+
+def put(kind: str, **kwargs) -> None:
+    """Queue one log row; kwargs are those of the matching ActivityLogger helper"""
+    global _dropped
+    if kind not in _WRITERS:
+        raise ValueError(f"Unknown log kind: {kind}")
+    if _started_pid != os.getpid() and _app is not None:
+        # Forked after start(): threads don't survive fork, so start this process's writer
+        start(_app)
+    try:
+        _queue.put_nowait((kind, kwargs))
+    except queue.Full:
+        # Reported by the writer with its next batch, not once per request
+        _dropped += 1
+
+
+def _write_batch(app, batch):
+    """
+    Insert a batch of queued entries in a single transaction
+    If the batch fails, replay it one row per transaction so a bad entry
+    only loses itself
+    """
+    with app.app_context():
+        try:
+            for kind, kwargs in batch:
+                _WRITERS[kind](**kwargs)
+            db.session.commit()
+            return
+        except Exception:
+            db.session.rollback()
+            if len(batch) == 1:
+                app.logger.exception("Dropped activity log entry: %r", batch[0])
+                return
+            app.logger.warning("Activity log batch of %d failed; retrying row by row", len(batch))
+
+        for entry in batch:
+            kind, kwargs = entry
+            try:
+                _WRITERS[kind](**kwargs)
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                app.logger.exception("Dropped activity log entry: %r", entry)
+
+
+def _report_dropped(app):
+    global _dropped
+    if _dropped:
+        dropped, _dropped = _dropped, 0
+        app.logger.warning("Activity log queue full; dropped %d entries", dropped)
+
+
+def _worker(app):
+    """
+    Drain the queue, flushing every BATCH_SIZE entries or FLUSH_INTERVAL seconds
+    Exits after writing the batch in hand once it receives _STOP
+    """
+    while True:
+        item = _queue.get()
+        if item is _STOP:
+            return
+        batch = [item]
+        deadline = time.monotonic() + FLUSH_INTERVAL
+        stopping = False
+
+        while len(batch) < BATCH_SIZE:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = _queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is _STOP:
+                stopping = True
+                break
+            batch.append(item)
+
+        _write_batch(app, batch)
+        _report_dropped(app)
+        if stopping:
+            return
+
+
+def flush(app):
+    """Synchronously write any queued entries"""
+    batch = []
+    while True:
+        try:
+            item = _queue.get_nowait()
+        except queue.Empty:
+            break
+        if item is not _STOP:
+            batch.append(item)
+    for i in range(0, len(batch), BATCH_SIZE):
+        _write_batch(app, batch[i:i + BATCH_SIZE])
+    _report_dropped(app)
+
+
+def _shutdown(app):
+    """
+    atexit hook: let the writer commit the batch it already dequeued (daemon
+    threads are killed once atexit handlers finish), then write what is left
+    """
+    worker = _worker_thread
+    if worker is not None and worker.is_alive():
+        try:
+            _queue.put(_STOP, timeout=SHUTDOWN_TIMEOUT)
+        except queue.Full:
+            pass
+        worker.join(SHUTDOWN_TIMEOUT)
+    flush(app)
+
+
+def start(app):
+    """Start the background writer once per process and flush on exit"""
+    global _started_pid, _app, _worker_thread
+    with _start_lock:
+        if _started_pid == os.getpid():
+            return
+        # The atexit hook is inherited across fork; register it only once
+        first_start = _started_pid is None
+        _started_pid = os.getpid()
+        _app = app
+
+    _worker_thread = threading.Thread(target=_worker, args=(app,), daemon=True, name='activity-log-writer')
+    _worker_thread.start()
+    if first_start:
+        atexit.register(_shutdown, app)
@@ -3,16 +3,42 @@ MFA Service for StockaDoodle
 Handles email-based two-factor authentication for admin/manager roles  
 """  
   
-import random  
-import string  
+import base64  
+import heapq  
+import hmac  
+import logging  
+import secrets  
 import smtplib  
+import threading  
+from concurrent.futures import ThreadPoolExecutor  
 from datetime import datetime, timedelta  
-from typing import Dict, Optional  
+from typing import Dict, List, Optional, Tuple  
+  
+logger = logging.getLogger(__name__)  
+  
+  
+def _log_send_result(future) -> None:  
+    """Done-callback for background sends: _send_email logs its own failures, this catches the rest"""  
+    exc = future.exception()  
+    if exc is not None:  
+        logger.error("MFA email send raised", exc_info=exc)  
+  
   
 class MFAService:  
     """Singleton service for MFA code generation and verification"""  
     _instance = None  
     _active_mfa_codes: Dict[str, Dict] = {}  # {username: {'code': str, 'expiry': datetime}}  
+    _expiry_heap: List[Tuple[datetime, str]] = []  # min-heap of (expiry, username)  
+    # Request threads issue and verify codes concurrently; guards both structures above  
+    _codes_lock = threading.Lock()  
+      
+    # One authenticated SMTP connection reused across sends, guarded by a lock  
+    _smtp_conn: Optional[smtplib.SMTP] = None  
+    _smtp_key: Optional[Tuple[str, int, str]] = None  
+    _smtp_lock = threading.Lock()  
+      
+    # Sends run off the request thread; one worker since they share one connection  
+    _email_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='mfa-smtp')  
       
     def __new__(cls):  
         if cls._instance is None:  
@@ -20,30 +46,69 @@ class MFAService:
         return cls._instance  
       
     def generate_mfa_code(self, length: int = 6) -> str:  
-        """Generate random alphanumeric MFA code"""  
-        characters = string.ascii_uppercase + string.digits  
-        return ''.join(random.choice(characters) for _ in range(length))  
+        """Generate a cryptographically random base32 (A-Z, 2-7) MFA code"""  
+        return base64.b32encode(secrets.token_bytes(length)).decode('ascii')[:length]  
+      
+    def _sweep(self, now: datetime) -> None:  
+        """Evict expired codes in O(log N) each, popping from the expiry heap. Caller holds _codes_lock."""  
+        heap = self._expiry_heap  
+        while heap and heap[0][0] < now:  
+            expiry, username = heapq.heappop(heap)  
+            info = self._active_mfa_codes.get(username)  
+            # Skip heap entries superseded by a newer code for the same user  
+            if info is not None and info['expiry'] == expiry:  
+                del self._active_mfa_codes[username]  
       
+    def _ensure_smtp_conn(self, smtp_server: str, smtp_port: int,  
+                          smtp_username: str, smtp_password: str) -> smtplib.SMTP:  
+        """Return the pooled SMTP connection, (re)connecting if needed. Caller holds _smtp_lock."""  
+        key = (smtp_server, smtp_port, smtp_username)  
+        if self._smtp_conn is not None and self._smtp_key == key:  
+            return self._smtp_conn  
+  
+        self._close_smtp_conn()  
+        server = smtplib.SMTP(smtp_server, smtp_port)  
+        server.starttls()  
+        server.login(smtp_username, smtp_password)  
+        MFAService._smtp_conn = server  
+        MFAService._smtp_key = key  
+        return server  
+  
+    def _close_smtp_conn(self) -> None:  
+        """Drop the pooled SMTP connection. Caller holds _smtp_lock."""  
+        if self._smtp_conn is not None:  
+            try:  
+                self._smtp_conn.quit()  
+            except (smtplib.SMTPException, OSError):  
+                pass  
+        MFAService._smtp_conn = None  
+        MFAService._smtp_key = None  
+  
     def _send_email(self, receiver_email: str, subject: str, body: str,   
                     smtp_server: str, smtp_port: int,   
                     smtp_username: str, smtp_password: str) -> bool:  
-        """Send email via SMTP"""  
+        """Send email via the pooled SMTP connection"""  
         sender_email = smtp_username  
           
         # Prepare message  
         message = f"From: {sender_email}\nTo: {receiver_email}\nSubject: {subject}\n\n{body}"  
           
-        try:  
-            server = smtplib.SMTP(smtp_server, smtp_port)  
-            server.starttls()  
-            server.login(smtp_username, smtp_password)  
-            server.sendmail(sender_email, receiver_email, message)  
-            server.quit()  
-            print(f"MFA email sent to {receiver_email}")  
-            return True  
-        except Exception as e:  
-            print(f"Failed to send MFA email: {e}")  
-            return False  
+        with self._smtp_lock:  
+            try:  
+                try:  
+                    server = self._ensure_smtp_conn(smtp_server, smtp_port, smtp_username, smtp_password)  
+                    server.sendmail(sender_email, receiver_email, message)  
+                except smtplib.SMTPServerDisconnected:  
+                    # Pooled connection went stale; reconnect and retry once  
+                    self._close_smtp_conn()  
+                    server = self._ensure_smtp_conn(smtp_server, smtp_port, smtp_username, smtp_password)  
+                    server.sendmail(sender_email, receiver_email, message)  
+                logger.info("MFA email sent to %s", receiver_email)  
+                return True  
+            except Exception as e:  
+                self._close_smtp_conn()  
+                logger.warning("Failed to send MFA email to %s: %s", receiver_email, e)  
+                return False  
       
     def send_mfa_code(self, user_email: str, username: str,   
                       smtp_config: Dict) -> bool:  
@@ -55,16 +120,34 @@ class MFAService:
             username: Username for personalization  
             smtp_config: Dict with keys: server, port, username, password,   
                         code_length, expiry_minutes  
+          
+        Returns:  
+            True once the email is queued; delivery happens in the background.  
+            False if the recipient or SMTP configuration is unusable.  
         """  
+        # Checked synchronously; the background send can't report back to the caller  
+        if (not isinstance(user_email, str) or '@' not in user_email  
+                or any(c in user_email for c in '\r\n')):  
+            logger.warning("MFA code not sent to %s: invalid recipient %r", username, user_email)  
+            return False  
+        missing = [key for key in ('server', 'port', 'username', 'password') if not smtp_config.get(key)]  
+        if missing:  
+            logger.error("MFA code not sent: SMTP config missing %s", ', '.join(missing))  
+            return False  
+          
         code = self.generate_mfa_code(smtp_config.get('code_length', 6))  
         expiry_minutes = smtp_config.get('expiry_minutes', 5)  
-        expiry_time = datetime.now() + timedelta(minutes=expiry_minutes)  
+        now = datetime.now()  
+        expiry_time = now + timedelta(minutes=expiry_minutes)  
           
-        # Store code  
-        self._active_mfa_codes[username] = {  
-            'code': code,  
-            'expiry': expiry_time  
-        }  
+        # Store code, sweeping stale entries first  
+        with self._codes_lock:  
+            self._sweep(now)  
+            self._active_mfa_codes[username] = {  
+                'code': code,  
+                'expiry': expiry_time  
+            }  
+            heapq.heappush(self._expiry_heap, (expiry_time, username))  
           
         # Email content  
         subject = "Your StockaDoodle Login Code"  
@@ -82,7 +165,8 @@ Sincerely,
 StockaDoodle Team  
 """  
           
-        return self._send_email(  
+        future = self._email_executor.submit(  
+            self._send_email,  
             receiver_email=user_email,  
             subject=subject,  
             body=body,  
@@ -91,28 +175,36 @@ StockaDoodle Team
             smtp_username=smtp_config['username'],  
             smtp_password=smtp_config['password']  
         )  
+        future.add_done_callback(_log_send_result)  
+        return True  
       
     def verify_mfa_code(self, username: str, entered_code: str) -> bool:  
         """Verify MFA code for username"""  
-        if username not in self._active_mfa_codes:  
-            print(f"No MFA code for {username}")  
+        if not isinstance(entered_code, str):  
+            logger.info("Invalid MFA code for %s", username)  
             return False  
           
-        stored_info = self._active_mfa_codes[username]  
-        stored_code = stored_info['code']  
-        expiry_time = stored_info['expiry']  
-          
-        # Check expiry  
-        if datetime.now() > expiry_time:  
-            del self._active_mfa_codes[username]  
-            print(f"MFA code expired for {username}")  
-            return False  
+        with self._codes_lock:  
+            now = datetime.now()  
+            self._sweep(now)  
+            stored_info = self._active_mfa_codes.get(username)  
+            if stored_info is None:  
+                logger.info("No MFA code for %s", username)  
+                return False  
+              
+            # Check expiry  
+            if now > stored_info['expiry']:  
+                del self._active_mfa_codes[username]  
+                logger.info("MFA code expired for %s", username)  
+                return False  
+              
+            # Verify code (codes are stored uppercase; compare in constant time).  
+            # Compare bytes: compare_digest rejects non-ASCII str arguments  
+            if hmac.compare_digest(entered_code.strip().upper().encode(), stored_info['code'].encode()):  
+                # Deleted under the lock, so a code can only be used once  
+                del self._active_mfa_codes[username]  
+                logger.info("MFA code verified for %s", username)  
+                return True  
           
-        # Verify code  
-        if entered_code == stored_code:  
-            del self._active_mfa_codes[username]  
-            print(f"MFA code verified for {username}")  
-            return True  
-        else:  
-            print(f"Invalid MFA code for {username}")  
-            return False
\ No newline at end of file
+        logger.info("Invalid MFA code for %s", username)  
+        return False
\ No newline at end of file
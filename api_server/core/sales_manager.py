@@ -1,10 +1,13 @@
 # api_server/core/sales_manager.py
 from app import db
+from sqlalchemy import case, func, update
 from models.sale import Sale
 from models.product import Product
 from models.retailer_metrics import RetailerMetrics
-from core.activity_logger import ActivityLogger
-from datetime import date, timedelta
+from models.product_log import ProductLog
+from models.sale_item import SaleItem
+from core.dashboard_cache import DashboardCache
+from datetime import date, datetime, timedelta
 import json
 
 class SalesManager:
@@ -22,23 +25,60 @@ class SalesManager:
             if not items or total_amount is None:
                 return None, "Invalid sale payload"
 
-            # Validate & adjust stock
+            # One timestamp for the sale row and all of its log rows
+            now = datetime.utcnow()
+            today = date.today()  # local calendar day drives the streak
+
+            # Fetch and row-lock every product in the basket with a single IN query,
+            # so concurrent checkouts cannot both pass the stock check (no-op on SQLite)
+            pids = [int(it['product_id']) for it in items if it.get('product_id') is not None]
+            products = {
+                p.id: p
+                for p in Product.query.filter(Product.id.in_(pids)).with_for_update().all()
+            }
+
+            # Validate stock and compute the new level for each product
+            new_levels = {}
             for it in items:
                 pid = it.get('product_id')
                 qty = int(it.get('quantity', 0))
                 if qty <= 0:
                     raise ValueError(f"Invalid quantity for product {pid}")
-                product = Product.query.get(pid)
+                product = products.get(int(pid)) if pid is not None else None
                 if not product:
                     raise ValueError(f"Product {pid} not found")
-                if product.stock_level < qty:
+                current = new_levels.get(product.id, product.stock_level)
+                if current < qty:
                     raise ValueError(f"Insufficient stock for product {pid}")
-                product.stock_level -= qty
+                new_levels[product.id] = current - qty
+
+            # Deduct stock for the whole basket in one UPDATE ... CASE statement
+            db.session.execute(
+                update(Product)
+                .where(Product.id.in_(list(new_levels)))
+                .values(stock_level=case(new_levels, value=Product.id))
+                .execution_options(synchronize_session=False)
+            )
 
             # Create sale
             sale_json = json.dumps(items)
-            sale = Sale(retailer_id=retailer_id, total_amount=total_amount, sale_items_json=sale_json)
+            sale = Sale(retailer_id=retailer_id, total_amount=total_amount, sale_items_json=sale_json, timestamp=now)
             db.session.add(sale)
+            db.session.flush()  # get id
+
+            # Normalized line items, so an undo can restock in SQL without parsing the JSON
+            db.session.execute(
+                SaleItem.__table__.insert(),
+                [
+                    {
+                        'sale_id': sale.id,
+                        'product_id': int(it['product_id']),
+                        'quantity': int(it.get('quantity', 0)),
+                        'price': float(it['price']) if it.get('price') is not None else None
+                    }
+                    for it in items
+                ]
+            )
 
             # Update metrics
             metrics = RetailerMetrics.query.filter_by(retailer_id=retailer_id).first()
@@ -47,7 +87,6 @@ class SalesManager:
                 db.session.add(metrics)
 
             metrics.daily_quota_usd = (metrics.daily_quota_usd or 0.0) + float(total_amount)
-            today = date.today()
             if metrics.last_sale_date is None:
                 metrics.current_streak = 1
             else:
@@ -64,29 +103,64 @@ class SalesManager:
                     metrics.current_streak = 1
             metrics.last_sale_date = today
 
-            # Log each product action (sale)
-            for it in items:
-                ActivityLogger.log_product_action(it.get('product_id'), retailer_id, 'Sale', f"Qty {it.get('quantity')}")
+            # Log each product action (sale) in one bulk insert
+            logs = [
+                ProductLog(
+                    product_id=it.get('product_id'),
+                    user_id=retailer_id,
+                    action_type='Sale',
+                    notes=f"Qty {it.get('quantity')}",
+                    # Same default source ActivityLogger.log_product_action applies
+                    source="Desktop App",
+                    log_time=now
+                )
+                for it in items
+            ]
+            db.session.bulk_save_objects(logs)
 
             db.session.commit()
+            DashboardCache.invalidate(
+                DashboardCache.ADMIN_KEY,
+                DashboardCache.MANAGER_KEY,
+                DashboardCache.retailer_key(retailer_id)
+            )
             return sale, None
         except Exception as e:
             db.session.rollback()
             return None, str(e)
 
     @staticmethod
-    def get_sales_report(start_date, end_date):
+    def get_sales_report(start_date, end_date, by_day=False):
         # expects datetime or date objects
-        q = Sale.query
+        conds = []
         if start_date:
-            q = q.filter(Sale.timestamp >= start_date)
+            conds.append(Sale.timestamp >= start_date)
         if end_date:
-            q = q.filter(Sale.timestamp <= end_date)
-        sales = q.all()
-        total = sum(s.total_amount for s in sales)
-        return {
-            'total_revenue': total,
-            'transactions': len(sales),
+            conds.append(Sale.timestamp <= end_date)
+
+        # Let the database reduce the rows; Python only sees the aggregates
+        total, count = db.session.query(
+            func.coalesce(func.sum(Sale.total_amount), 0),
+            func.count(Sale.id)
+        ).filter(*conds).one()
+
+        report = {
+            'total_revenue': float(total),
+            'transactions': count,
             'start_date': start_date.isoformat() if start_date else None,
             'end_date': end_date.isoformat() if end_date else None
         }
+
+        if by_day:
+            day = func.date(Sale.timestamp)
+            rows = db.session.query(
+                day,
+                func.sum(Sale.total_amount),
+                func.count(Sale.id)
+            ).filter(*conds).group_by(day).order_by(day).all()
+            report['daily'] = [
+                {'date': str(d), 'total_revenue': float(t or 0), 'transactions': c}
+                for d, t, c in rows
+            ]
+
+        return report
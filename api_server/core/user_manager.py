@@ -1,15 +1,18 @@
 # api_server/core/user_manager.py
 import hashlib
+import hmac
 from app import db
 from models.user import User
 from models.retailer_metrics import RetailerMetrics
+from core.dashboard_cache import DashboardCache
 
 # Simple SHA256 hashing (for demo only). Replace with bcrypt/argon2 in production.
 def hash_password(password: str) -> str:
     return hashlib.sha256(password.encode('utf-8')).hexdigest()
 
 def verify_password(stored_hash: str, provided_password: str) -> bool:
-    return stored_hash == hash_password(provided_password)
+    # Constant-time compare so response timing does not leak hash prefixes
+    return hmac.compare_digest(stored_hash or '', hash_password(provided_password))
 
 class UserManager:
     @staticmethod
@@ -25,6 +28,7 @@ class UserManager:
             metrics = RetailerMetrics(retailer_id=u.id)
             db.session.add(metrics)
         db.session.commit()
+        DashboardCache.invalidate(DashboardCache.ADMIN_KEY)
         return u, None
 
     @staticmethod
@@ -69,4 +73,5 @@ class UserManager:
             return False, "User not found"
         db.session.delete(user)
         db.session.commit()
+        DashboardCache.invalidate(DashboardCache.ADMIN_KEY, DashboardCache.retailer_key(user_id))
         return True, None
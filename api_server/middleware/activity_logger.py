@@ -1,11 +1,28 @@
 """  
 Flask middleware for automatic API activity logging  
 Logs all POST/PUT/PATCH/DELETE requests  
+  
+Log rows are handed to core.log_buffer, which writes them in batches from a  
+background thread, so mutating requests never wait on the log INSERT/COMMIT.  
 """  
   
+import re  
+from datetime import datetime  
+  
 from flask import request  
-from core.activity_logger import ActivityLogger  
-from app import db  
+from core import log_buffer  
+  
+  
+_LOGGED_METHODS = frozenset({'POST', 'PUT', 'PATCH', 'DELETE'})  
+  
+# /api/v1/<collection>[/<id>] -> (collection, id)  
+_PATH_RE = re.compile(r'/api/v1/(users|products|categories|sales)(?:/(\d+))?')  
+_ENTITY_NAMES = {  
+    'users': 'user',  
+    'products': 'product',  
+    'categories': 'category',  
+    'sales': 'sale'  
+}  
   
   
 def log_api_activity(response):  
@@ -14,46 +31,31 @@ def log_api_activity(response):
     Called automatically by Flask after each request  
     """  
     # Only log mutation operations  
-    if request.method in ['POST', 'PUT', 'PATCH', 'DELETE']:  
-        try:  
-            # Extract target entity from path  
-            path = request.path  
-            target_entity = None  
-            target_id = None  
-              
-            if '/users/' in path:  
-                target_entity = 'user'  
-            elif '/products/' in path:  
-                target_entity = 'product'  
-            elif '/categories/' in path:  
-                target_entity = 'category'  
-            elif '/sales/' in path:  
-                target_entity = 'sale'  
-              
-            # Extract ID from path if present  
-            path_parts = path.split('/')  
-            if len(path_parts) > 0 and path_parts[-1].isdigit():  
-                target_id = int(path_parts[-1])  
-              
-            # Get IP address  
-            ip_address = request.remote_addr  
-              
-            # Log the operation  
-            ActivityLogger.log_api_operation(  
-                method=request.method,  
-                path=path,  
-                target_entity=target_entity,  
-                target_id=target_id,  
-                ip_address=ip_address,  
-                user_id=None  # No user ID in open API  
-            )  
-              
-            db.session.commit()  
-              
-        except Exception as e:  
-            print(f"Error logging API activity: {e}")  
-            db.session.rollback()  
-      
+    if request.method not in _LOGGED_METHODS:  
+        return response  
+  
+    try:  
+        # Extract target entity and ID from the path in one match  
+        path = request.path  
+        match = _PATH_RE.search(path)  
+        target_entity = _ENTITY_NAMES[match.group(1)] if match else None  
+        target_id = int(match.group(2)) if match and match.group(2) else None  
+  
+        # Queue the operation for the background writer  
+        log_buffer.put(  
+            'api',  
+            method=request.method,  
+            path=path,  
+            target_entity=target_entity,  
+            target_id=target_id,  
+            ip_address=request.remote_addr,  
+            user_id=None,  # No user ID in open API  
+            log_time=datetime.utcnow()  
+        )  
+  
+    except Exception as e:  
+        print(f"Error logging API activity: {e}")  
+  
     return response  
   
   
@@ -62,4 +64,5 @@ def init_activity_logging(app):
     Initialize activity logging middleware  
     Call this in app.py after creating the Flask app  
     """  
-    app.after_request(log_api_activity)
+    app.after_request(log_api_activity)  
+    log_buffer.start(app)
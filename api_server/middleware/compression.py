@@ -0,0 +1,86 @@
+"""
+Flask middleware for response compression
+Gzips (or Brotli-encodes, when the brotli package is installed) JSON responses
+large enough for compression to pay off
+"""
+
+import gzip
+
+from flask import request
+
+try:
+    import brotli  # optional: smaller payloads than gzip at similar CPU cost
+except ImportError:
+    brotli = None
+
+
+# Smaller bodies fit in a packet or two; compressing them only costs CPU
+MIN_SIZE = 1024
+GZIP_LEVEL = 5
+_COMPRESSIBLE_TYPES = ('application/json', 'text/')
+
+
+def _parse_accept_encoding(accept_encoding):
+    """{coding: q} from an Accept-Encoding header; a missing or malformed q counts as 1"""
+    accepted = {}
+    for part in accept_encoding.split(','):
+        coding, *params = part.split(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    pass
+        accepted[coding] = q
+    return accepted
+
+
+def _choose_encoding(accept_encoding):
+    """Pick the best encoding the client accepts (q > 0), or None; ties go to Brotli"""
+    accepted = _parse_accept_encoding(accept_encoding)
+    wildcard = accepted.get('*', 0.0)
+    candidates = ('br', 'gzip') if brotli is not None else ('gzip',)
+    best, best_q = None, 0.0
+    for coding in candidates:
+        q = accepted.get(coding, wildcard)
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def compress_response(response):
+    """After-request hook that compresses eligible responses in place"""
+    if (response.direct_passthrough
+            or response.is_streamed
+            or not 200 <= response.status_code < 300
+            or 'Content-Encoding' in response.headers
+            or not (response.mimetype or '').startswith(_COMPRESSIBLE_TYPES)):
+        return response
+    
+    response.vary.add('Accept-Encoding')
+    encoding = _choose_encoding(request.headers.get('Accept-Encoding', ''))
+    if encoding is None:
+        return response
+    
+    body = response.get_data()
+    if len(body) < MIN_SIZE:
+        return response
+    
+    if encoding == 'br':
+        body = brotli.compress(body, quality=4)
+    else:
+        body = gzip.compress(body, compresslevel=GZIP_LEVEL)
+    
+    response.set_data(body)
+    response.headers['Content-Encoding'] = encoding
+    return response
+
+
+def init_compression(app):
+    """Register compression middleware with Flask app"""
+    app.after_request(compress_response)
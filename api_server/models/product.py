@@ -1,5 +1,6 @@
 # api_server/models/product.py
 from app import db
+from sqlalchemy import DDL, event
 from datetime import date
 
 class Product(db.Model):
@@ -10,23 +11,61 @@ class Product(db.Model):
     min_stock_level = db.Column(db.Integer, default=10, nullable=False)
     price = db.Column(db.Float, nullable=False)
     expiration_date = db.Column(db.Date, nullable=True)
-    image_blob = db.Column(db.LargeBinary, nullable=True)
+    # Deferred: only loaded when accessed or undefer()'d, so listings skip the blob
+    image_blob = db.deferred(db.Column(db.LargeBinary, nullable=True))
 
     category_id = db.Column(db.Integer, db.ForeignKey('categories.id'), nullable=True)
 
     log_entries = db.relationship('ProductLog', backref='product', lazy=True)
 
-    def to_dict(self, include_image=False):
-        d = {
-            'id': self.id,
-            'name': self.name,
-            'stock_level': self.stock_level,
-            'min_stock_level': self.min_stock_level,
-            'price': float(self.price) if self.price is not None else None,
-            'category_id': self.category_id,
-            'expiration_date': self.expiration_date.isoformat() if self.expiration_date else None
-        }
+    __table_args__ = (
+        # Trigram GIN index so name ILIKE '%term%' avoids a sequential scan (Postgres only)
+        db.Index(
+            'ix_products_name_trgm', 'name',
+            postgresql_using='gin',
+            postgresql_ops={'name': 'gin_trgm_ops'}
+        ).ddl_if(dialect='postgresql'),
+        # FULLTEXT index backing the MATCH ... AGAINST search (MySQL only)
+        db.Index('ix_products_name_ft', 'name', mysql_prefix='FULLTEXT').ddl_if(dialect='mysql'),
+    )
+
+    # Keys of to_dict() without the image, each read from the same-named attribute,
+    # so ORM instances and Core rows of summary_columns() serialize the same way
+    SERIALIZED_FIELDS = ('id', 'name', 'stock_level', 'min_stock_level',
+                         'price', 'category_id', 'expiration_date')
+
+    @classmethod
+    def summary_columns(cls, fields=None):
+        """Columns needed for to_dict(fields=fields) without the image"""
+        return tuple(getattr(cls, f) for f in (fields or cls.SERIALIZED_FIELDS))
+
+    @staticmethod
+    def row_to_dict(row, fields=None):
+        """Same shape as to_dict(), built from a summary_columns() row"""
+        d = {}
+        for f in fields or Product.SERIALIZED_FIELDS:
+            value = getattr(row, f)
+            convert = _CONVERTERS.get(f)
+            d[f] = convert(value) if convert and value is not None else value
+        return d
+
+    def to_dict(self, include_image=False, fields=None):
+        d = Product.row_to_dict(self, fields)
         if include_image and self.image_blob:
             import base64
             d['image_base64'] = base64.b64encode(self.image_blob).decode('utf-8')
         return d
+
+
+_CONVERTERS = {
+    'price': float,
+    'expiration_date': date.isoformat,
+}
+
+
+# gin_trgm_ops needs the pg_trgm extension before the table's indexes are created
+event.listen(
+    Product.__table__,
+    'before_create',
+    DDL('CREATE EXTENSION IF NOT EXISTS pg_trgm').execute_if(dialect='postgresql')
+)
@@ -10,14 +10,34 @@ class ProductLog(db.Model):
 
     action_type = db.Column(db.String(50), nullable=False)
     notes = db.Column(db.Text, nullable=True)
+    source = db.Column(db.String(16), nullable=True)  # Desktop App, API
     log_time = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
 
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'product_id': self.product_id,
-            'user_id': self.user_id,
-            'action_type': self.action_type,
-            'notes': self.notes,
-            'log_time': self.log_time.isoformat()
-        }
+    # Every log query sorts by log_time DESC; keep it last in each index
+    __table_args__ = (
+        db.Index('ix_log_time', log_time.desc()),
+        db.Index('ix_log_product_time', 'product_id', log_time.desc()),
+        db.Index('ix_log_user_time', 'user_id', log_time.desc()),
+        db.Index('ix_log_action_time', 'action_type', log_time.desc()),
+        db.Index('ix_log_source_time', 'source', log_time.desc()),
+    )
+
+    # Keys of to_dict(), each read from the same-named attribute (ORM instance or Core row)
+    SERIALIZED_FIELDS = ('id', 'product_id', 'user_id', 'action_type', 'notes', 'source', 'log_time')
+
+    @classmethod
+    def columns(cls, fields=None):
+        """Columns needed for to_dict(fields=fields)"""
+        return tuple(getattr(cls, f) for f in (fields or cls.SERIALIZED_FIELDS))
+
+    @staticmethod
+    def row_to_dict(row, fields=None):
+        """Same shape as to_dict(), built from a columns() row"""
+        d = {}
+        for f in fields or ProductLog.SERIALIZED_FIELDS:
+            value = getattr(row, f)
+            d[f] = value.isoformat() if f == 'log_time' and value is not None else value
+        return d
+
+    def to_dict(self, fields=None):
+        return ProductLog.row_to_dict(self, fields)
@@ -8,7 +8,7 @@ class RetailerMetrics(db.Model):
     retailer_id = db.Column(db.Integer, db.ForeignKey('users.id'), unique=True, nullable=False)
 
     current_streak = db.Column(db.Integer, default=0, nullable=False)
-    daily_quota_usd = db.Column(db.Float, default=0.0, nullable=False)
+    daily_quota_usd = db.Column(db.Float, default=0.0, nullable=False, index=True)  # leaderboard ORDER BY
     last_sale_date = db.Column(db.Date, nullable=True)
 
     def to_dict(self):
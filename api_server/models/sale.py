@@ -6,7 +6,7 @@ class Sale(db.Model):
     __tablename__ = 'sales'
     id = db.Column(db.Integer, primary_key=True)
     retailer_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
-    timestamp = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    timestamp = db.Column(db.DateTime, default=datetime.utcnow, nullable=False, index=True)
     total_amount = db.Column(db.Float, nullable=False)
     # store items as JSON text
     sale_items_json = db.Column(db.Text, nullable=False)
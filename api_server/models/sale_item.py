@@ -0,0 +1,18 @@
+# api_server/models/sale_item.py
+from app import db
+
+class SaleItem(db.Model):
+    __tablename__ = 'sale_items'
+    id = db.Column(db.Integer, primary_key=True)
+    sale_id = db.Column(db.Integer, db.ForeignKey('sales.id', ondelete='CASCADE'), nullable=False, index=True)
+    # SET NULL so deleting a product that has been sold keeps the sale history
+    product_id = db.Column(db.Integer, db.ForeignKey('products.id', ondelete='SET NULL'), nullable=True)
+    quantity = db.Column(db.Integer, nullable=False)
+    price = db.Column(db.Float, nullable=True)
+
+    def to_dict(self):
+        return {
+            'product_id': self.product_id,
+            'quantity': self.quantity,
+            'price': self.price
+        }
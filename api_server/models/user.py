@@ -10,7 +10,8 @@ class User(db.Model):
     password_hash = db.Column(db.String(128), nullable=False)
     role = db.Column(db.String(20), default='Retailer')  # Admin, Manager, Retailer
     is_active = db.Column(db.Boolean, default=True)
-    profile_pic_blob = db.Column(db.LargeBinary, nullable=True)
+    # Deferred like Product.image_blob: user listings and logins never need the picture
+    profile_pic_blob = db.deferred(db.Column(db.LargeBinary, nullable=True))
     created_at = db.Column(db.DateTime(timezone=True), server_default=func.now())
 
     # Relationships (defined as strings to avoid circular import issues on import time)
@@ -4,8 +4,11 @@ Already implemented in previous artifact
 """
 from flask import Blueprint, request, jsonify
 from models.api_activity_log import APIActivityLog
+from datetime import datetime, timedelta
 from sqlalchemy import func
 from app import db
+from core.dashboard_cache import DashboardCache
+from utils.dates import parse_timestamp
 
 bp = Blueprint('admin', __name__)
 
@@ -22,6 +25,8 @@ def get_activity_logs():
         - end_date: Filter by end date (ISO format)
         - limit: Max results (default 100)
         - offset: Pagination offset (default 0)
+        - after_id: Keyset cursor, return logs older than this ID (replaces offset)
+        - with_total: Include the total match count (extra COUNT query)
     """
     # Build query with filters
     query = APIActivityLog.query
@@ -50,49 +55,65 @@ def get_activity_logs():
     start_date = request.args.get('start_date')
     end_date = request.args.get('end_date')
     if start_date:
-        from dateutil import parser
         try:
-            query = query.filter(APIActivityLog.timestamp >= parser.parse(start_date))
-        except:
+            query = query.filter(APIActivityLog.timestamp >= parse_timestamp(start_date))
+        except (ValueError, OverflowError):
             pass
     if end_date:
-        from dateutil import parser
         try:
-            query = query.filter(APIActivityLog.timestamp <= parser.parse(end_date))
-        except:
+            query = query.filter(APIActivityLog.timestamp <= parse_timestamp(end_date))
+        except (ValueError, OverflowError):
             pass
     
     # Pagination
     limit = request.args.get('limit', 100, type=int)
     offset = request.args.get('offset', 0, type=int)
+    after_id = request.args.get('after_id', type=int)
+    with_total = request.args.get('with_total', 'false').lower() in ('1', 'true')
     
     # Ensure reasonable limits
     limit = min(limit, 1000)  # Max 1000 per request
     
+    # Total is optional - the COUNT re-scans the whole filtered set
+    total = None
+    if with_total:
+        total = query.with_entities(func.count(APIActivityLog.id)).scalar()
+    
+    # Keyset pagination skips the OFFSET walk on deep pages
+    if after_id:
+        query = query.filter(APIActivityLog.id < after_id)
+        offset = 0
+    
     # Order by most recent first
-    query = query.order_by(APIActivityLog.timestamp.desc())
+    query = query.order_by(APIActivityLog.timestamp.desc(), APIActivityLog.id.desc())
     
-    # Execute query
-    total = query.count()
-    logs = query.offset(offset).limit(limit).all()
+    # Fetch one extra row to know whether another page exists
+    logs = query.offset(offset).limit(limit + 1).all()
+    has_more = len(logs) > limit
+    logs = logs[:limit]
     
-    return jsonify({
-        'total': total,
+    response = {
         'offset': offset,
         'limit': limit,
         'count': len(logs),
+        'has_more': has_more,
+        'next_after_id': logs[-1].id if has_more else None,
         'logs': [log.to_dict() for log in logs]
-    }), 200
+    }
+    if total is not None:
+        response['total'] = total
+    
+    return jsonify(response), 200
 
 
-@bp.route('/activity_logs/summary', methods=['GET'])
-def activity_logs_summary():
-    """
-    GET /api/v1/admin/activity_logs/summary
-    Returns summary statistics about API activity
-    """
-    # Total logs
-    total_logs = APIActivityLog.query.count()
+# Full-table breakdowns are rolled up at most once per this many seconds
+SUMMARY_TTL = 60
+SUMMARY_KEY = 'admin:activity_summary'
+
+
+def _activity_rollup():
+    """Whole-table counts and GROUP BY breakdowns (the expensive part of the summary)"""
+    total_logs = db.session.query(func.count(APIActivityLog.id)).scalar()
     
     # Logs by method
     by_method = db.session.query(
@@ -112,17 +133,33 @@ def activity_logs_summary():
         func.count(APIActivityLog.id)
     ).filter(APIActivityLog.target_entity.isnot(None)).group_by(APIActivityLog.target_entity).all()
     
-    # Recent activity (last 24 hours)
-    from datetime import datetime, timedelta
+    return {
+        'total_logs': total_logs,
+        'by_method': dict(by_method),
+        'by_source': dict(by_source),
+        'by_entity': dict(by_entity)
+    }
+
+
+@bp.route('/activity_logs/summary', methods=['GET'])
+def activity_logs_summary():
+    """
+    GET /api/v1/admin/activity_logs/summary
+    Returns summary statistics about API activity
+    Totals and breakdowns may be up to SUMMARY_TTL seconds old; recent_24h is live
+    """
+    rollup = DashboardCache.get_or_compute(SUMMARY_KEY, _activity_rollup, ttl=SUMMARY_TTL)
+    
+    # Recent activity (last 24 hours) is a range count on the timestamp index
     yesterday = datetime.utcnow() - timedelta(days=1)
-    recent_count = APIActivityLog.query.filter(
+    recent_count = db.session.query(func.count(APIActivityLog.id)).filter(
         APIActivityLog.timestamp >= yesterday
-    ).count()
+    ).scalar()
     
     return jsonify({
-        'total_logs': total_logs,
+        'total_logs': rollup['total_logs'],
         'recent_24h': recent_count,
-        'by_method': dict(by_method),
-        'by_source': dict(by_source),
-        'by_entity': dict(by_entity)
-    }), 200
\ No newline at end of file
+        'by_method': rollup['by_method'],
+        'by_source': rollup['by_source'],
+        'by_entity': rollup['by_entity']
+    }), 200
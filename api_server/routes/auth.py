@@ -7,10 +7,22 @@ from flask import Blueprint, request, jsonify
 import os  
 from core.mfa_service import MFAService  
 from models.user import User  
+from app import db  
+from utils import ratelimit  
   
 bp = Blueprint('auth', __name__)  
 mfa_service = MFAService()  
   
+# SMTP configuration from environment, read once at import (load_dotenv has run by then)  
+_SMTP_CONFIG = {  
+    'server': os.getenv('SMTP_SERVER', 'smtp.gmail.com'),  
+    'port': int(os.getenv('SMTP_PORT', '587')),  
+    'username': os.getenv('SMTP_USERNAME'),  
+    'password': os.getenv('SMTP_PASSWORD'),  
+    'code_length': int(os.getenv('MFA_CODE_LENGTH', '6')),  
+    'expiry_minutes': int(os.getenv('MFA_CODE_EXPIRY_MINUTES', '5'))  
+}  
+  
 @bp.route('/mfa/send', methods=['POST'])  
 def send_mfa_code():  
     """  
@@ -25,20 +37,16 @@ def send_mfa_code():
     if not username or not email:  
         return jsonify({'error': 'Username and email required'}), 400  
       
-    # Verify user exists and has admin/manager role  
-    user = User.query.filter_by(username=username).first()  
-    if not user or user.role not in ['Admin', 'Manager']:  
+    # Checked before any DB or SMTP work so retry loops are shed cheaply  
+    if not ratelimit.allow(f'mfa:send:{request.remote_addr}:{username}', 3, 300):  
+        return jsonify({'error': 'Too many requests'}), 429  
+      
+    # Verify user exists and has admin/manager role (only the role column is needed)  
+    role = db.session.query(User.role).filter_by(username=username).scalar()  
+    if role not in ('Admin', 'Manager'):  
         return jsonify({'error': 'MFA not required for this user'}), 403  
       
-    # SMTP configuration from environment  
-    smtp_config = {  
-        'server': os.getenv('SMTP_SERVER', 'smtp.gmail.com'),  
-        'port': int(os.getenv('SMTP_PORT', '587')),  
-        'username': os.getenv('SMTP_USERNAME'),  
-        'password': os.getenv('SMTP_PASSWORD'),  
-        'code_length': int(os.getenv('MFA_CODE_LENGTH', '6')),  
-        'expiry_minutes': int(os.getenv('MFA_CODE_EXPIRY_MINUTES', '5'))  
-    }  
+    smtp_config = _SMTP_CONFIG  
       
     # Validate SMTP credentials  
     if not smtp_config['username'] or not smtp_config['password']:  
@@ -67,6 +75,10 @@ def verify_mfa_code():
     if not username or not code:  
         return jsonify({'error': 'Username and code required'}), 400  
       
+    # 5 attempts per 5 minutes per user, so 6-character codes cannot be brute-forced  
+    if not ratelimit.allow(f'mfa:verify:{username}', 5, 300):  
+        return jsonify({'error': 'Too many attempts', 'valid': False}), 429  
+      
     # Verify code  
     is_valid = mfa_service.verify_mfa_code(username, code)  
       
@@ -1,14 +1,28 @@
+import time
 from flask import Blueprint, request, jsonify
 from app import db
 from models.category import Category
 
 bp = Blueprint('categories', __name__)
 
+# The category list is small and rarely changes: serve it from memory for
+# up to CACHE_TTL seconds, dropping it on every write below
+CACHE_TTL = 60
+_cache = {'payload': None, 'expires': 0.0}
+
+def _invalidate_cache():
+    _cache['payload'] = None
+
 @bp.route('', methods=['GET'])
 def list_categories():
     """GET /api/v1/categories"""
-    cats = Category.query.all()
-    return jsonify([c.to_dict() for c in cats]), 200
+    payload = _cache['payload']
+    now = time.monotonic()
+    if payload is None or now >= _cache['expires']:
+        payload = [c.to_dict() for c in Category.query.all()]
+        _cache['expires'] = now + CACHE_TTL
+        _cache['payload'] = payload
+    return jsonify(payload), 200
 
 @bp.route('', methods=['POST'])
 def create_category():
@@ -24,6 +38,7 @@ def create_category():
     cat = Category(name=name)
     db.session.add(cat)
     db.session.commit()
+    _invalidate_cache()
     return jsonify(cat.to_dict()), 201
 
 @bp.route('/<int:cat_id>', methods=['PUT'])
@@ -38,6 +53,7 @@ def update_category(cat_id):
         cat.name = data['name']
     
     db.session.commit()
+    _invalidate_cache()
     return jsonify(cat.to_dict()), 200
 
 @bp.route('/<int:cat_id>', methods=['DELETE'])
@@ -49,4 +65,5 @@ def delete_category(cat_id):
     
     db.session.delete(cat)
     db.session.commit()
+    _invalidate_cache()
     return jsonify({"message": "Category deleted"}), 200
\ No newline at end of file
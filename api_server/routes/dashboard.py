@@ -1,32 +1,100 @@
-from flask import Blueprint, jsonify
+from flask import Blueprint, request, jsonify
+from sqlalchemy import case, func, select
+import orjson
+from app import db
+from core.dashboard_cache import DashboardCache
 from models.user import User
 from models.product import Product
 from models.sale import Sale
+from models.product_log import ProductLog
 
 bp = Blueprint('dashboard', __name__)
 
+
+def _count_of(model):
+    """Scalar COUNT(*) subquery so several counts share one round-trip"""
+    return select(func.count()).select_from(model).scalar_subquery()
+
+
+def _admin_counts():
+    """Admin KPI totals (cached)"""
+    def compute():
+        total_users, total_products, total_sales = db.session.execute(
+            select(_count_of(User), _count_of(Product), _count_of(Sale))
+        ).one()
+        return {
+            'total_users': total_users,
+            'total_products': total_products,
+            'total_sales': total_sales
+        }
+    
+    return DashboardCache.get_or_compute(DashboardCache.ADMIN_KEY, compute)
+
+
+def _recent_desktop_activity(limit):
+    """Latest desktop-app actions with usernames, newest first (uses ix_log_source_time)"""
+    rows = db.session.execute(
+        select(ProductLog.action_type, ProductLog.notes, ProductLog.log_time, User.username)
+        .outerjoin(User, User.id == ProductLog.user_id)
+        .where(ProductLog.source == 'Desktop App')
+        .order_by(ProductLog.log_time.desc())
+        .limit(limit)
+    ).all()
+    
+    activity = []
+    for row in rows:
+        try:
+            target = orjson.loads(row.notes).get('target') if row.notes else None
+        except (orjson.JSONDecodeError, AttributeError):
+            target = None
+        activity.append({
+            'username': row.username or 'System',
+            'action': row.action_type,
+            'target': target or 'N/A',
+            'timestamp': row.log_time.isoformat() if row.log_time else None
+        })
+    return activity
+
+
 @bp.route('/admin', methods=['GET'])
 def admin_dashboard():
     """GET /api/v1/dashboard/admin"""
+    return jsonify(_admin_counts()), 200
+
+@bp.route('/admin/overview', methods=['GET'])
+def admin_overview():
+    """
+    GET /api/v1/dashboard/admin/overview?logs_limit=10
+    KPI totals and recent desktop activity in one response
+    """
+    logs_limit = min(max(request.args.get('logs_limit', 10, type=int), 0), 100)
     return jsonify({
-        'total_users': User.query.count(),
-        'total_products': Product.query.count(),
-        'total_sales': Sale.query.count()
+        'kpi': _admin_counts(),
+        'recent_logs': _recent_desktop_activity(logs_limit) if logs_limit else []
     }), 200
 
 @bp.route('/manager', methods=['GET'])
 def manager_dashboard():
     """GET /api/v1/dashboard/manager"""
-    low_stock = Product.query.filter(Product.stock_level < Product.min_stock_level).count()
-    expiring = Product.query.filter(Product.expiration_date.isnot(None)).count()
-    return jsonify({
-        'low_stock_count': low_stock,
-        'expiring_count': expiring
-    }), 200
+    def compute():
+        # Both counts from a single pass over products
+        low_stock, expiring = db.session.query(
+            func.coalesce(func.sum(case((Product.stock_level < Product.min_stock_level, 1), else_=0)), 0),
+            func.coalesce(func.sum(case((Product.expiration_date.isnot(None), 1), else_=0)), 0)
+        ).one()
+        return {
+            'low_stock_count': int(low_stock),
+            'expiring_count': int(expiring)
+        }
+    
+    return jsonify(DashboardCache.get_or_compute(DashboardCache.MANAGER_KEY, compute)), 200
 
 @bp.route('/retailer/<int:user_id>', methods=['GET'])
 def retailer_dashboard(user_id):
     """GET /api/v1/dashboard/retailer/<id>"""
     from models.retailer_metrics import RetailerMetrics
-    m = RetailerMetrics.query.filter_by(retailer_id=user_id).first()
-    return jsonify(m.to_dict() if m else {}), 200
+    def compute():
+        m = RetailerMetrics.query.filter_by(retailer_id=user_id).first()
+        return m.to_dict() if m else {}
+    
+    return jsonify(DashboardCache.get_or_compute(DashboardCache.retailer_key(user_id), compute)), 200
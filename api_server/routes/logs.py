@@ -1,22 +1,29 @@
+from datetime import datetime
 from flask import Blueprint, request, jsonify
 from models.product_log import ProductLog
 from models.product import Product
-from core.activity_logger import ActivityLogger  
+from core import log_buffer
+from core.dashboard_cache import DashboardCache
 from app import db
+from utils.projection import requested_fields
 
 bp = Blueprint('logs', __name__)
 
+def _log_rows(*criteria):
+    """Plain-column log rows (optionally projected with ?fields=), newest first"""
+    fields = requested_fields(ProductLog.SERIALIZED_FIELDS)
+    rows = db.session.query(*ProductLog.columns(fields)).filter(*criteria).order_by(ProductLog.log_time.desc())
+    return [ProductLog.row_to_dict(row, fields) for row in rows]
+
 @bp.route('/product/<int:product_id>', methods=['GET'])
 def logs_for_product(product_id):
-    """GET /api/v1/log/product/<id>"""
-    logs = ProductLog.query.filter_by(product_id=product_id).order_by(ProductLog.log_time.desc()).all()
-    return jsonify([l.to_dict() for l in logs]), 200
+    """GET /api/v1/log/product/<id>?fields="""
+    return jsonify(_log_rows(ProductLog.product_id == product_id)), 200
 
 @bp.route('/user/<int:user_id>', methods=['GET'])
 def logs_for_user(user_id):
-    """GET /api/v1/log/user/<id>"""
-    logs = ProductLog.query.filter_by(user_id=user_id).order_by(ProductLog.log_time.desc()).all()
-    return jsonify([l.to_dict() for l in logs]), 200
+    """GET /api/v1/log/user/<id>?fields="""
+    return jsonify(_log_rows(ProductLog.user_id == user_id)), 200
 
 @bp.route('/dispose', methods=['POST'])
 def dispose_product():
@@ -45,6 +52,7 @@ def dispose_product():
         )
         db.session.add(log)
         db.session.commit()
+        DashboardCache.invalidate(DashboardCache.MANAGER_KEY)
         
         return jsonify(log.to_dict()), 201
     except Exception as e:
@@ -52,39 +60,84 @@ def dispose_product():
         return jsonify({"error": str(e)}), 500
 
 
+def _desktop_user_id(value):  
+    """  
+    Normalise a desktop payload's user_id to an int, or None for anonymous actions  
+    Raises ValueError for anything else  
+    """  
+    if value is None or value == '' or value == 'anonymous':  
+        return None  
+    if isinstance(value, bool):  
+        raise ValueError(value)  
+    if isinstance(value, int):  
+        return value  
+    if isinstance(value, str) and value.strip().isdigit():  
+        return int(value)  
+    raise ValueError(value)  
+  
+  
+def _queue_desktop_action(data):  
+    """  
+    Hand one desktop action payload to the log buffer  
+    Returns an error message, or None when the action was queued  
+    """  
+    # Validated here: a bad FK value would otherwise only fail later, in the  
+    # buffered batch, after the client already got its 202  
+    try:  
+        user_id = _desktop_user_id(data.get('user_id'))  
+    except ValueError:  
+        return "user_id must be an integer"  
+      
+    # The desktop client sends action_type/target_entity/target_name  
+    action = data.get('action') or data.get('action_type')  
+    target = data.get('target') or data.get('target_name') or data.get('target_entity')  
+    details = data.get('details')  
+    if details is None:  
+        # Keep the rest of the payload as a dict; ActivityLogger orjson-encodes it into notes  
+        details = {  
+            k: v for k, v in data.items()  
+            if k not in ('user_id', 'action', 'action_type', 'target', 'details')  
+        }  
+      
+    if not action:  
+        return "Action is required"  
+      
+    # Buffered: the row is written with the next batch, not in this request  
+    log_buffer.put(  
+        'user',  
+        user_id=user_id,  
+        action=action,  
+        target=target or "N/A",  
+        details=details,  
+        source="Desktop App",  
+        log_time=datetime.utcnow()  
+    )  
+    return None  
+
+
 @bp.route('/desktop', methods=['POST'])  
 def log_desktop_action():  
     """  
     POST /api/v1/log/desktop  
     Endpoint for desktop app to log user actions  
     """  
-    data = request.get_json() or {}  
+    error = _queue_desktop_action(request.get_json() or {})  
+    if error:  
+        return jsonify({"error": error}), 400  
       
-    user_id = data.get('user_id')  
-    action = data.get('action')  
-    target = data.get('target')  
-    details = data.get('details')  
+    return jsonify({"message": "Desktop action queued"}), 202  
+
+
+@bp.route('/desktop/batch', methods=['POST'])  
+def log_desktop_actions():  
+    """  
+    POST /api/v1/log/desktop/batch  
+    Several desktop actions in one request: a JSON array of /log/desktop payloads  
+    """  
+    actions = request.get_json()  
+    if not isinstance(actions, list) or not all(isinstance(a, dict) for a in actions):  
+        return jsonify({"error": "Expected a JSON array of actions"}), 400  
       
-    if not action:  
-        return jsonify({"error": "Action is required"}), 400  
+    rejected = sum(1 for a in actions if _queue_desktop_action(a))  
       
-    try:  
-        log = ActivityLogger.log_user_action(  
-            user_id=user_id,  
-            action=action,  
-            target=target or "N/A",  
-            details=details,  
-            source="Desktop App"  
-        )  
-        db.session.commit()  
-          
-        return jsonify({  
-            "message": "Desktop action logged",  
-            "log_id": log.id  
-        }), 201  
-          
-    except Exception as e:  
-        db.session.rollback()  
-        return jsonify({"error": str(e)}), 500
-
-    
\ No newline at end of file
+    return jsonify({"queued": len(actions) - rejected, "rejected": rejected}), 202  
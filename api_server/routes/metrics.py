@@ -1,4 +1,4 @@
-from flask import Blueprint, jsonify
+from flask import Blueprint, request, jsonify
 from models.retailer_metrics import RetailerMetrics
 
 bp = Blueprint('metrics', __name__)
@@ -13,6 +13,7 @@ def retailer_metrics(user_id):
 
 @bp.route('/leaderboard', methods=['GET'])
 def leaderboard():
-    """GET /api/v1/retailer/leaderboard"""
-    top = RetailerMetrics.query.order_by(RetailerMetrics.daily_quota_usd.desc()).limit(10).all()
+    """GET /api/v1/retailer/leaderboard?limit=10"""
+    limit = max(1, min(request.args.get('limit', 10, type=int), 100))
+    top = RetailerMetrics.query.order_by(RetailerMetrics.daily_quota_usd.desc()).limit(limit).all()
     return jsonify([m.to_dict() for m in top]), 200
\ No newline at end of file
@@ -1,16 +1,27 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify
+from sqlalchemy import func, select
+from sqlalchemy.orm import raiseload, undefer
 from app import db
 from models.product import Product
 from models.category import Category
 from utils.validators import validate_product_data, validate_or_400
 from core.activity_logger import ActivityLogger  
-import base64
+from core.inventory_manager import InventoryManager
+from utils.projection import requested_fields
+from core.dashboard_cache import DashboardCache
+import binascii
 
 bp = Blueprint('products', __name__)
 
 @bp.route('', methods=['GET'])
 def list_products():
-    """GET /api/v1/products?category_id=&search=&page=&per_page="""
+    """
+    GET /api/v1/products?category_id=&search=&page=&per_page=
+    GET /api/v1/products?cursor=<last_id>&per_page=  (keyset paging: no COUNT, no OFFSET)
+    Optional ?fields=id,name,... limits the selected columns and returned keys
+    Stock/expiry views: ?low_stock=true, ?max_stock=N, ?out_of_stock=true,
+    ?expiring_days=N, ?expired=true
+    """
     category_id = request.args.get('category_id', type=int)
     search = request.args.get('search')
     include_image = request.args.get('include_image', 'false').lower() == 'true'
@@ -19,40 +30,132 @@ def list_products():
     page = request.args.get('page', 1, type=int)
     per_page = request.args.get('per_page', 50, type=int)
     per_page = min(per_page, 100)  # Max 100 per page
+    cursor = request.args.get('cursor', type=int)
+    fields = requested_fields(Product.SERIALIZED_FIELDS)
     
-    q = Product.query
+    filters = []
     if category_id:
-        q = q.filter(Product.category_id == category_id)
+        filters.append(Product.category_id == category_id)
     if search:
-        q = q.filter(Product.name.ilike(f"%{search}%"))
+        filters.append(InventoryManager.name_search_filter(search))
+    if cursor is not None:
+        filters.append(Product.id > cursor)
+    filters.extend(InventoryManager.stock_filters(
+        low_stock=request.args.get('low_stock', 'false').lower() == 'true',
+        max_stock=request.args.get('max_stock', type=int),
+        out_of_stock=request.args.get('out_of_stock', 'false').lower() == 'true',
+        expiring_days=request.args.get('expiring_days', type=int),
+        expired=request.args.get('expired', 'false').lower() == 'true'
+    ))
     
-    # Execute with pagination
-    total = q.count()
-    prods = q.offset((page - 1) * per_page).limit(per_page).all()
+    # Without images, a Core select of plain columns: no ORM hydration or identity map per row.
+    # With images, ORM rows; to_dict() reads no relationships and raiseload keeps it that way
+    if include_image:
+        stmt = select(Product).options(undefer(Product.image_blob), raiseload('*'))
+    else:
+        stmt = select(*Product.summary_columns(fields))
+    stmt = stmt.where(*filters).order_by(Product.id)
+    
+    if cursor is not None:
+        # Fetch one extra row to know whether another page exists
+        stmt = stmt.limit(per_page + 1)
+    else:
+        stmt = stmt.offset((page - 1) * per_page).limit(per_page)
+    
+    result = db.session.execute(stmt)
+    if include_image:
+        products = [p.to_dict(include_image=True, fields=fields) for p in result.scalars()]
+    else:
+        products = [Product.row_to_dict(row, fields) for row in result]
+    
+    if cursor is not None:
+        has_more = len(products) > per_page
+        products = products[:per_page]
+        return jsonify({
+            'products': products,
+            'per_page': per_page,
+            'has_more': has_more,
+            'next_cursor': products[-1]['id'] if has_more else None
+        }), 200
+    
+    # The total is a direct COUNT rather than Query.count(), which wraps the SELECT in a subquery
+    total = db.session.query(func.count(Product.id)).filter(*filters).scalar()
     
     return jsonify({
-        'products': [p.to_dict(include_image=include_image) for p in prods],
+        'products': products,
         'total': total,
         'page': page,
         'per_page': per_page,
         'pages': (total + per_page - 1) // per_page
     }), 200
 
+@bp.route('/overview', methods=['GET'])
+def products_overview():
+    """
+    GET /api/v1/products/overview?expiring_days=7
+    Low stock, out of stock, expiring soon, expired and inventory value in one response
+    """
+    expiring_days = request.args.get('expiring_days', 7, type=int)
+    return jsonify(InventoryManager.get_overview(expiring_days)), 200
+
+@bp.route('/inventory_value', methods=['GET'])
+def inventory_value():
+    """GET /api/v1/products/inventory_value"""
+    total_value, product_count = InventoryManager.get_inventory_value()
+    return jsonify({
+        'total_value': total_value,
+        'product_count': product_count
+    }), 200
+
 @bp.route('/<int:product_id>', methods=['GET'])
 def get_product(product_id):
     """GET /api/v1/products/<id>"""
-    p = Product.query.get(product_id)
+    include_image = request.args.get('include_image', 'false').lower() == 'true'
+    q = Product.query.options(raiseload('*'))
+    if include_image:
+        q = q.options(undefer(Product.image_blob))
+    p = q.get(product_id)
     if not p:
         return jsonify({"error": "Product not found"}), 404
     
-    include_image = request.args.get('include_image', 'false').lower() == 'true'
     return jsonify(p.to_dict(include_image=include_image)), 200
 
-@bp.route('', methods=['POST'])
-def create_product():
-    """POST /api/v1/products"""
-    data = request.get_json() or {}
+# Leading magic bytes -> MIME type for stored product images
+_IMAGE_SIGNATURES = (
+    (b'\xff\xd8\xff', 'image/jpeg'),
+    (b'\x89PNG\r\n\x1a\n', 'image/png'),
+    (b'GIF8', 'image/gif'),
+    (b'RIFF', 'image/webp'),
+)
+
+@bp.route('/<int:product_id>/image', methods=['GET'])
+def get_product_image(product_id):
+    """
+    GET /api/v1/products/<id>/image
+    Raw image bytes: no Base64 inflation, no JSON wrapping
+    """
+    row = db.session.execute(
+        select(Product.image_blob).where(Product.id == product_id)
+    ).first()
+    if row is None:
+        return jsonify({"error": "Product not found"}), 404
+    
+    blob = row.image_blob
+    if not blob:
+        return jsonify({"error": "Product has no image"}), 404
     
+    mimetype = next(
+        (mime for magic, mime in _IMAGE_SIGNATURES if blob.startswith(magic)),
+        'application/octet-stream'
+    )
+    return Response(blob, mimetype=mimetype)
+
+def _decode_image(image_base64):
+    """Decode an image_base64 field; a2b_base64 skips b64decode's extra validation pass"""
+    return binascii.a2b_base64(image_base64)
+
+def _create_product(data, image_blob):
+    """Validate `data` and insert the product with an already-decoded image"""
     # Validate input
     error_resp, status = validate_or_400(validate_product_data, data, is_update=False)
     if error_resp:
@@ -63,14 +166,6 @@ def create_product():
         if not Category.query.get(data['category_id']):
             return jsonify({"error": "Category not found"}), 404
     
-    # Handle image Base64
-    image_blob = None
-    if data.get('image_base64'):
-        try:
-            image_blob = base64.b64decode(data['image_base64'])
-        except Exception:
-            return jsonify({"error": "Invalid image_base64"}), 400
-    
     try:
         p = Product(
             name=data['name'],
@@ -85,11 +180,46 @@ def create_product():
         
         db.session.add(p)
         db.session.commit()
+        DashboardCache.invalidate(DashboardCache.ADMIN_KEY, DashboardCache.MANAGER_KEY)
         return jsonify(p.to_dict()), 201
     except Exception as e:
         db.session.rollback()
         return jsonify({"error": str(e)}), 500
 
+@bp.route('', methods=['POST'])
+def create_product():
+    """POST /api/v1/products"""
+    data = request.get_json() or {}
+    
+    # Handle image Base64
+    image_blob = None
+    if data.get('image_base64'):
+        try:
+            image_blob = _decode_image(data['image_base64'])
+        except (binascii.Error, ValueError):
+            return jsonify({"error": "Invalid image_base64"}), 400
+    
+    return _create_product(data, image_blob)
+
+@bp.route('/multipart', methods=['POST'])
+def create_product_multipart():
+    """
+    POST /api/v1/products/multipart
+    multipart/form-data variant of create_product: product fields as form fields,
+    raw image bytes in the 'image' file part (no Base64 inflation or decode)
+    """
+    data = request.form.to_dict()
+    for field in ('category_id', 'stock_level', 'min_stock_level'):
+        if data.get(field):
+            data[field] = request.form.get(field, type=int)
+    if data.get('price'):
+        data['price'] = request.form.get('price', type=float)
+    
+    image = request.files.get('image')
+    image_blob = image.read() if image else None
+    
+    return _create_product(data, image_blob or None)
+
 @bp.route('/<int:product_id>', methods=['PUT'])
 def update_product(product_id):
     """PUT /api/v1/products/<id>"""
@@ -108,6 +238,14 @@ def update_product(product_id):
         if not Category.query.get(data['category_id']):
             return jsonify({"error": "Category not found"}), 404
     
+    # Decode before touching the session so no row state is held during CPU work
+    image_blob = None
+    if data.get('image_base64'):
+        try:
+            image_blob = _decode_image(data['image_base64'])
+        except (binascii.Error, ValueError):
+            return jsonify({"error": "Invalid image_base64"}), 400
+    
     try:
         if 'name' in data:
             p.name = data['name']
@@ -124,12 +262,10 @@ def update_product(product_id):
         if 'category_id' in data:
             p.category_id = data['category_id']
         if 'image_base64' in data:
-            try:
-                p.image_blob = base64.b64decode(data['image_base64']) if data['image_base64'] else None
-            except Exception:
-                return jsonify({"error": "Invalid image_base64"}), 400
+            p.image_blob = image_blob
         
         db.session.commit()
+        DashboardCache.invalidate(DashboardCache.MANAGER_KEY)
         return jsonify(p.to_dict()), 200
     except Exception as e:
         db.session.rollback()
@@ -152,5 +288,6 @@ def delete_product(product_id):
       
     db.session.delete(product)  
     db.session.commit()  
+    DashboardCache.invalidate(DashboardCache.ADMIN_KEY, DashboardCache.MANAGER_KEY)  
       
     return jsonify({"message": "Product deleted"}), 200
\ No newline at end of file
@@ -1,7 +1,10 @@
 from flask import Blueprint, request, jsonify
+from sqlalchemy import case, delete, func, select, update
 from core.sales_manager import SalesManager
+from core.dashboard_cache import DashboardCache
 from models.sale import Sale
 from app import db
+from utils.dates import parse_timestamp
 
 bp = Blueprint('sales', __name__)
 
@@ -33,23 +36,57 @@ def undo_sale(sale_id):
     import json
     from models.product import Product
     from models.retailer_metrics import RetailerMetrics
+    from models.sale_item import SaleItem
     
     try:
-        items = json.loads(sale.sale_items_json)
-        for it in items:
-            pid = it.get('product_id')
-            qty = int(it.get('quantity', 0))
-            p = Product.query.get(pid)
-            if p:
-                p.stock_level += qty
+        retailer_id = sale.retailer_id
+        
+        if db.session.query(SaleItem.query.filter_by(sale_id=sale_id).exists()).scalar():
+            # Restock straight from the normalized line items: one correlated UPDATE,
+            # no JSON parse and no Python loop
+            restock_qty = (
+                select(func.sum(SaleItem.quantity))
+                .where(SaleItem.sale_id == sale_id, SaleItem.product_id == Product.id)
+                .scalar_subquery()
+            )
+            db.session.execute(
+                update(Product)
+                .where(Product.id.in_(select(SaleItem.product_id).where(SaleItem.sale_id == sale_id)))
+                .values(stock_level=Product.stock_level + restock_qty)
+                .execution_options(synchronize_session=False)
+            )
+            db.session.execute(delete(SaleItem).where(SaleItem.sale_id == sale_id))
+        else:
+            # Sales recorded before sale_items existed only have the JSON blob
+            qtys = {}
+            for it in json.loads(sale.sale_items_json):
+                pid = it.get('product_id')
+                if pid is None:
+                    continue
+                qtys[int(pid)] = qtys.get(int(pid), 0) + int(it.get('quantity', 0))
+            
+            # Restock the whole basket in one relative UPDATE ... CASE; the increment
+            # is applied by the database, so concurrent sales cannot be overwritten
+            if qtys:
+                db.session.execute(
+                    update(Product)
+                    .where(Product.id.in_(list(qtys)))
+                    .values(stock_level=Product.stock_level + case(qtys, value=Product.id, else_=0))
+                    .execution_options(synchronize_session=False)
+                )
         
         # Adjust metrics
-        metrics = RetailerMetrics.query.filter_by(retailer_id=sale.retailer_id).first()
+        metrics = RetailerMetrics.query.filter_by(retailer_id=retailer_id).first()
         if metrics:
             metrics.daily_quota_usd = max(0.0, (metrics.daily_quota_usd or 0.0) - (sale.total_amount or 0.0))
         
         db.session.delete(sale)
         db.session.commit()
+        DashboardCache.invalidate(
+            DashboardCache.ADMIN_KEY,
+            DashboardCache.MANAGER_KEY,
+            DashboardCache.retailer_key(retailer_id)
+        )
         return jsonify({"message": "Sale undone"}), 200
     except Exception as e:
         db.session.rollback()
@@ -57,13 +94,13 @@ def undo_sale(sale_id):
 
 @bp.route('/reports', methods=['GET'])
 def sales_reports():
-    """GET /api/v1/sales/reports?start=&end="""
+    """GET /api/v1/sales/reports?start=&end=&by_day="""
     start = request.args.get('start')
     end = request.args.get('end')
+    by_day = request.args.get('by_day', 'false').lower() == 'true'
     
-    from dateutil import parser
-    sd = parser.parse(start) if start else None
-    ed = parser.parse(end) if end else None
+    sd = parse_timestamp(start) if start else None
+    ed = parse_timestamp(end) if end else None
     
-    report = SalesManager.get_sales_report(sd, ed)
+    report = SalesManager.get_sales_report(sd, ed, by_day=by_day)
     return jsonify(report), 200
@@ -0,0 +1 @@
+"""Request-level helpers shared by the route modules"""
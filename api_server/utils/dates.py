@@ -0,0 +1,15 @@
+# api_server/utils/dates.py
+from datetime import datetime
+
+
+def parse_timestamp(value: str) -> datetime:
+    """
+    Parse a timestamp query parameter.
+    ISO-8601 (what the desktop client sends) goes through datetime.fromisoformat;
+    anything else falls back to dateutil. Raises ValueError if neither can parse it.
+    """
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        from dateutil import parser
+        return parser.parse(value)
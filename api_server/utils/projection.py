@@ -0,0 +1,16 @@
+# api_server/utils/projection.py
+from flask import request
+
+
+def requested_fields(allowed, required=('id',)):
+    """
+    Parse ?fields=a,b,c into a tuple of serializable field names.
+    Unknown names are ignored; `required` fields are always included.
+    Returns None (all fields) when the parameter is absent or selects nothing.
+    """
+    raw = request.args.get('fields')
+    if not raw:
+        return None
+    wanted = {f.strip() for f in raw.split(',')}
+    fields = tuple(f for f in allowed if f in wanted or f in required)
+    return fields if set(fields) - set(required) else None
@@ -0,0 +1,27 @@
+# api_server/utils/ratelimit.py
+import threading
+import time
+
+# {key: [count, window_ends_at]}
+_counters = {}
+_lock = threading.Lock()
+
+# Sweep expired windows once the table grows past this many keys
+_SWEEP_THRESHOLD = 10000
+
+
+def allow(key: str, limit: int, window: int) -> bool:
+    """
+    Fixed-window rate limiter (INCR + EXPIRE semantics), kept in process memory.
+    Returns False once `key` has been seen more than `limit` times in `window` seconds.
+    """
+    now = time.monotonic()
+    with _lock:
+        entry = _counters.get(key)
+        if entry is None or entry[1] <= now:
+            if len(_counters) >= _SWEEP_THRESHOLD:
+                for k in [k for k, (_, ends) in _counters.items() if ends <= now]:
+                    del _counters[k]
+            entry = _counters[key] = [0, now + window]
+        entry[0] += 1
+        return entry[0] <= limit
@@ -1,4 +1,4 @@
 from .stockadoodle_api import StockaDoodleAPI
-from .common import APIResponse, role_required
+from .base import APIResponse, role_required
 
 __all__ = ['StockaDoodleAPI', 'APIResponse', 'role_required']
\ No newline at end of file
@@ -3,37 +3,63 @@ from functools import wraps
 
 class APIResponse:
     """Standardized API response wrapper"""
+    __slots__ = ('success', 'data', 'error', 'status_code')
+    
     def __init__(self, success: bool, data: Any = None, error: str = None, status_code: int = None):
         self.success = success
         self.data = data
         self.error = error
         self.status_code = status_code
     
+    @classmethod
+    def ok(cls, data: Any, status_code: int = 200) -> 'APIResponse':
+        """Successful response, built without the keyword-argument path"""
+        resp = cls.__new__(cls)
+        resp.success = True
+        resp.data = data
+        resp.error = None
+        resp.status_code = status_code
+        return resp
+    
     def __bool__(self):
         return self.success
+    
+    def __repr__(self):
+        if self.success:
+            return f"<APIResponse success=True data={type(self.data).__name__}>"
+        return f"<APIResponse success=False error='{self.error}'>"
 
 def role_required(*allowed_roles):
     """
     Decorator to enforce RBAC on client methods.
-    Imports current_session inside the wrapper to avoid circular imports with config.py.
+    current_session is imported when a method is decorated rather than at module
+    import, which still avoids the circular import with config.py.
+    Usage: @role_required('Admin', 'Manager')
+    Decorated methods accept background=True for calls the user did not trigger
+    (timer polls); those are still checked but don't count as session activity.
     """
+    allowed = frozenset(allowed_roles)
+    
     def decorator(func):
+        from utils.config import current_session
+        is_authenticated = current_session.is_authenticated
+        update_activity = current_session.update_activity
+        
         @wraps(func)
-        def wrapper(self, *args, **kwargs):
-            # Lazy import to prevent circular dependency with config.py
-            from utils.config import current_session
-            
-            if not current_session.is_authenticated():
+        def wrapper(self, *args, background=False, **kwargs):
+            if not is_authenticated():
                 return APIResponse(False, error="Not authenticated")
             
             user_role = current_session.role
-            if user_role not in allowed_roles:
+            if user_role not in allowed:
+                # Message is only formatted on the denial path
                 return APIResponse(
                     False,
                     error=f"Access denied. Required roles: {', '.join(allowed_roles)}. Your role: {user_role}"
                 )
             
-            current_session.update_activity()
+            if not background:
+                update_activity()
             return func(self, *args, **kwargs)
         return wrapper
-    return decorator
\ No newline at end of file
+    return decorator
@@ -1,24 +1,55 @@
 """
 Enhanced API client modules with advanced filtering and gamification
 """
+import threading
+import time
 from typing import List, Dict, Optional
-from datetime import datetime, timedelta, date
+from datetime import timedelta, date
 from .base import APIResponse, role_required
 
+def _is_iso_date(value) -> bool:
+    """Cheap shape check for a 'YYYY-MM-DD...' string"""
+    return isinstance(value, str) and len(value) >= 10 and value[4] == '-' and value[7] == '-'
+
+
 class EnhancedProductClient:
     """
     Enhanced product management client with advanced features
     Extends basic ProductClient with filtering, search, and inventory queries
     """
     
+    # How long a get_overview() result may answer the individual views
+    OVERVIEW_TTL = 2.0
+    # How long a list_all() response is reused (one dashboard render)
+    LIST_TTL = 2.0
+    
     def __init__(self, api):
         self.api = api
+        self._overview_cache = None  # (fetched_at, expiring_days, data)
+        self._list_cache = {}  # {include_image: (fetched_at, APIResponse)}
+        self._cache_lock = threading.Lock()
+    
+    def invalidate_cache(self):
+        """Drop cached listings/overview after a write"""
+        with self._cache_lock:
+            self._list_cache.clear()
+            self._overview_cache = None
     
     def list_all(self, include_image: bool = False) -> APIResponse:
-        """Get all products"""
-        return self.api._request('GET', 'products', params={
+        """Get all products (successful responses are reused for LIST_TTL seconds)"""
+        now = time.monotonic()
+        with self._cache_lock:
+            cached = self._list_cache.get(include_image)
+        if cached and now - cached[0] < self.LIST_TTL:
+            return cached[1]
+        
+        resp = self.api._request('GET', 'products', params={
             'include_image': 'true' if include_image else 'false'
         })
+        if resp.success:
+            with self._cache_lock:
+                self._list_cache[include_image] = (now, resp)
+        return resp
     
     def search(self, query: str, include_image: bool = False) -> APIResponse:
         """
@@ -46,6 +77,53 @@ class EnhancedProductClient:
             'include_image': 'true' if include_image else 'false'
         })
     
+    def _fetch_products(self, params: Dict) -> APIResponse:
+        """
+        GET /products with server-side filters, following cursor pages
+        Returns APIResponse whose data is the flat list of matching products
+        """
+        params = dict(params, include_image='false', per_page=100, cursor=0)
+        products = []
+        while True:
+            resp = self.api._request('GET', 'products', params=params)
+            if not resp.success:
+                return resp
+            page = resp.data
+            if not isinstance(page, dict):
+                # Older servers return a plain list
+                products.extend(page or [])
+                break
+            products.extend(page.get('products', []))
+            if not page.get('has_more'):
+                break
+            params['cursor'] = page['next_cursor']
+        return APIResponse(True, data=products)
+    
+    def get_overview(self, expiring_days: int = 7) -> APIResponse:
+        """
+        Low stock, out of stock, expiring soon, expired and inventory value
+        in a single request (GET /products/overview)
+        
+        Returns:
+            APIResponse with {'low_stock', 'out_of_stock', 'expiring_soon',
+            'expired': list, 'inventory_value': dict}
+        """
+        resp = self.api._request('GET', 'products/overview', params={'expiring_days': expiring_days})
+        if resp.success:
+            with self._cache_lock:
+                self._overview_cache = (time.monotonic(), expiring_days, resp.data)
+        return resp
+    
+    def _cached_view(self, key: str, expiring_days: int = None):
+        """Return one view from a fresh get_overview() result, or None"""
+        with self._cache_lock:
+            cached = self._overview_cache
+        if cached is None or time.monotonic() - cached[0] >= self.OVERVIEW_TTL:
+            return None
+        if expiring_days is not None and cached[1] != expiring_days:
+            return None
+        return APIResponse(True, data=cached[2][key])
+    
     def get_low_stock(self, threshold: int = None) -> APIResponse:
         """
         Get products with low stock
@@ -57,10 +135,20 @@ class EnhancedProductClient:
         Returns:
             APIResponse with list of low stock products
         """
-        resp = self.list_all()
+        if threshold is None:
+            cached = self._cached_view('low_stock')
+            if cached:
+                return cached
+        
+        if threshold is not None:
+            resp = self._fetch_products({'max_stock': threshold})
+        else:
+            resp = self._fetch_products({'low_stock': 'true'})
         if not resp.success:
             return resp
         
+        # The server already filtered; re-checking keeps older servers
+        # (which ignore the filter params) correct at negligible cost
         products = resp.data
         
         if threshold is not None:
@@ -77,7 +165,11 @@ class EnhancedProductClient:
     
     def get_out_of_stock(self) -> APIResponse:
         """Get products with zero stock"""
-        resp = self.list_all()
+        cached = self._cached_view('out_of_stock')
+        if cached:
+            return cached
+        
+        resp = self._fetch_products({'out_of_stock': 'true'})
         if not resp.success:
             return resp
         
@@ -91,46 +183,42 @@ class EnhancedProductClient:
         Args:
             days: Number of days threshold
         """
-        resp = self.list_all()
+        cached = self._cached_view('expiring_soon', expiring_days=days)
+        if cached:
+            return cached
+        
+        resp = self._fetch_products({'expiring_days': days})
         if not resp.success:
             return resp
         
-        products = resp.data
+        # ISO dates order the same as strings, so compare YYYY-MM-DD prefixes directly
         today = date.today()
-        threshold_date = today + timedelta(days=days)
-        
-        expiring = []
-        for p in products:
-            exp_date_str = p.get('expiration_date')
-            if exp_date_str:
-                try:
-                    exp_date = datetime.fromisoformat(exp_date_str).date()
-                    if today <= exp_date <= threshold_date:
-                        expiring.append(p)
-                except ValueError:
-                    continue
+        today_iso = today.isoformat()
+        threshold_iso = (today + timedelta(days=days)).isoformat()
+        
+        expiring = [
+            p for p in resp.data
+            if _is_iso_date(d := p.get('expiration_date')) and today_iso <= d[:10] <= threshold_iso
+        ]
         
         return APIResponse(True, data=expiring)
     
     def get_expired(self) -> APIResponse:
         """Get products that have already expired"""
-        resp = self.list_all()
+        cached = self._cached_view('expired')
+        if cached:
+            return cached
+        
+        resp = self._fetch_products({'expired': 'true'})
         if not resp.success:
             return resp
         
-        products = resp.data
-        today = date.today()
+        today_iso = date.today().isoformat()
         
-        expired = []
-        for p in products:
-            exp_date_str = p.get('expiration_date')
-            if exp_date_str:
-                try:
-                    exp_date = datetime.fromisoformat(exp_date_str).date()
-                    if exp_date < today:
-                        expired.append(p)
-                except ValueError:
-                    continue
+        expired = [
+            p for p in resp.data
+            if _is_iso_date(d := p.get('expiration_date')) and d[:10] < today_iso
+        ]
         
         return APIResponse(True, data=expired)
     
@@ -143,9 +231,12 @@ class EnhancedProductClient:
             product_id: Product ID
             new_stock_level: New stock quantity
         """
-        return self.api._request('PUT', f'products/{product_id}', json_data={
+        resp = self.api._request('PUT', f'products/{product_id}', json_data={
             'stock_level': new_stock_level
         })
+        if resp.success:
+            self.invalidate_cache()
+        return resp
     
     @role_required('Admin', 'Manager')
     def adjust_stock(self, product_id: int, delta: int) -> APIResponse:
@@ -171,7 +262,18 @@ class EnhancedProductClient:
         Calculate total inventory value
         Returns: APIResponse with {'total_value': float, 'product_count': int}
         """
-        resp = self.list_all()
+        cached = self._cached_view('inventory_value')
+        if cached:
+            return cached
+        
+        # Aggregated server-side: one small JSON object instead of the catalog
+        resp = self.api._request('GET', 'products/inventory_value')
+        if resp.success or resp.status_code not in (400, 404):
+            return resp
+        
+        # Older server without the endpoint: sum client-side, asking only
+        # for the two columns the sum needs
+        resp = self._fetch_products({'fields': 'price,stock_level'})
         if not resp.success:
             return resp
         
@@ -192,8 +294,26 @@ class RetailerMetricsClient:
     Handles streaks, quotas, and performance tracking
     """
     
+    # Leaderboard responses are reused for this many seconds
+    LEADERBOARD_TTL = 30.0
+    # Server-side cap on /retailer/leaderboard?limit=
+    LEADERBOARD_MAX_LIMIT = 100
+    
     def __init__(self, api):
         self.api = api
+        self._leaderboard_cache = {}  # {limit: (fetched_at, APIResponse)}
+        self._today_cache = (None, '', None)  # (monotonic second, ISO date, date)
+    
+    def _today(self):
+        """
+        (ISO string, date) for today, recomputed at most once per second so
+        per-retailer loops don't repeat date.today() and isoformat()
+        """
+        now = int(time.monotonic())
+        if now != self._today_cache[0]:
+            today = date.today()
+            self._today_cache = (now, today.isoformat(), today)
+        return self._today_cache[1], self._today_cache[2]
     
     def get_metrics(self, retailer_id: int) -> APIResponse:
         """
@@ -204,6 +324,16 @@ class RetailerMetricsClient:
         """
         return self.api._request('GET', f'retailer/{retailer_id}')
     
+    def get_metrics_many(self, retailer_ids: List[int]) -> Dict[int, APIResponse]:
+        """
+        Get metrics for several retailers with the requests issued concurrently
+        
+        Returns:
+            Dict mapping retailer_id to its APIResponse
+        """
+        responses = self.api.request_many([('GET', f'retailer/{rid}') for rid in retailer_ids])
+        return dict(zip(retailer_ids, responses))
+    
     def get_leaderboard(self, limit: int = 10) -> APIResponse:
         """
         Get top performers leaderboard
@@ -211,10 +341,16 @@ class RetailerMetricsClient:
         Args:
             limit: Number of top retailers to return
         """
-        resp = self.api._request('GET', 'retailer/leaderboard')
-        if resp.success and limit:
-            # Limit results
-            resp.data = resp.data[:limit]
+        now = time.monotonic()
+        cached = self._leaderboard_cache.get(limit)
+        if cached and now - cached[0] < self.LEADERBOARD_TTL:
+            return cached[1]
+        
+        # The server sorts and limits, so only `limit` rows cross the wire
+        params = {'limit': limit} if limit else None
+        resp = self.api._request('GET', 'retailer/leaderboard', params=params)
+        if resp.success:
+            self._leaderboard_cache[limit] = (now, resp)
         return resp
     
     def calculate_streak(self, retailer_id: int) -> APIResponse:
@@ -253,10 +389,10 @@ class RetailerMetricsClient:
         
         # Check if last sale was today
         last_sale_date = metrics.get('last_sale_date')
-        today = date.today().isoformat()
+        today_iso, _ = self._today()
         
         today_sales = 0.0
-        if last_sale_date == today:
+        if last_sale_date == today_iso:
             today_sales = daily_quota
         
         # Calculate progress percentage
@@ -292,50 +428,87 @@ class RetailerMetricsClient:
         if not resp.success:
             return {'achievements': [], 'error': resp.error}
         
-        metrics = resp.data
-        streak = metrics.get('current_streak', 0)
-        daily_quota = metrics.get('daily_quota_usd', 0.0)
+        return _score_achievements(resp.data)
+    
+    def get_achievements_batch(self, retailers: List[Dict] = None,
+                               retailer_ids: List[int] = None) -> Dict[int, Dict]:
+        """
+        Calculate achievements for many retailers without a request per retailer
         
-        achievements = []
-        
-        # Streak achievements
-        if streak >= 7:
-            achievements.append({
-                'name': 'Week Warrior',
-                'description': '7-day sales streak',
-                'icon': 'fire',
-                'tier': 'bronze'
-            })
-        if streak >= 30:
-            achievements.append({
-                'name': 'Monthly Master',
-                'description': '30-day sales streak',
-                'icon': 'star',
-                'tier': 'gold'
-            })
-        
-        # Sales volume achievements
-        if daily_quota >= 1000:
-            achievements.append({
-                'name': 'Thousand Club',
-                'description': '$1000+ in daily sales',
-                'icon': 'dollar-sign',
-                'tier': 'silver'
-            })
-        if daily_quota >= 5000:
-            achievements.append({
-                'name': 'High Roller',
-                'description': '$5000+ in daily sales',
-                'icon': 'trending-up',
-                'tier': 'platinum'
-            })
-        
-        return {
-            'achievements': achievements,
-            'total_count': len(achievements),
-            'streak': streak,
-            'quota': daily_quota
-        }
+        Args:
+            retailers: Metrics dicts (e.g. from get_leaderboard); fetched from the
+                       leaderboard endpoint (up to LEADERBOARD_MAX_LIMIT retailers)
+                       when omitted
+            retailer_ids: Alternatively, retailers whose metrics are fetched concurrently
+        
+        Returns:
+            Dict mapping retailer_id to the same data get_achievements returns
+        """
+        if retailers is None and retailer_ids:
+            return {
+                rid: _score_achievements(resp.data) if resp.success
+                else {'achievements': [], 'error': resp.error}
+                for rid, resp in self.get_metrics_many(retailer_ids).items()
+            }
+        
+        if retailers is None:
+            # Without an explicit limit the server returns only its default top 10
+            resp = self.get_leaderboard(limit=self.LEADERBOARD_MAX_LIMIT)
+            if not resp.success:
+                return {}
+            retailers = resp.data
+        
+        return {m.get('retailer_id'): _score_achievements(m) for m in retailers}
+
+
+# (metric key, threshold, badge) - a badge is earned when metric >= threshold
+_ACHIEVEMENT_RULES = (
+    # Streak achievements
+    ('current_streak', 7, {
+        'name': 'Week Warrior',
+        'description': '7-day sales streak',
+        'icon': 'fire',
+        'tier': 'bronze'
+    }),
+    ('current_streak', 30, {
+        'name': 'Monthly Master',
+        'description': '30-day sales streak',
+        'icon': 'star',
+        'tier': 'gold'
+    }),
+    # Sales volume achievements
+    ('daily_quota_usd', 1000, {
+        'name': 'Thousand Club',
+        'description': '$1000+ in daily sales',
+        'icon': 'dollar-sign',
+        'tier': 'silver'
+    }),
+    ('daily_quota_usd', 5000, {
+        'name': 'High Roller',
+        'description': '$5000+ in daily sales',
+        'icon': 'trending-up',
+        'tier': 'platinum'
+    }),
+)
+
+
+def _score_achievements(metrics: Dict) -> Dict:
+    """Achievement data for one retailer's metrics dict"""
+    streak = metrics.get('current_streak', 0)
+    daily_quota = metrics.get('daily_quota_usd', 0.0)
+    values = {'current_streak': streak or 0, 'daily_quota_usd': daily_quota or 0.0}
+    
+    achievements = [
+        dict(badge) for key, threshold, badge in _ACHIEVEMENT_RULES
+        if values[key] >= threshold
+    ]
+    
+    return {
+        'achievements': achievements,
+        'total_count': len(achievements),
+        'streak': streak,
+        'quota': daily_quota
+    }
 
 
 class EnhancedSalesClient:
@@ -5,56 +5,51 @@ Uses global UserSession for unified state management
 """
 
 import requests
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
 import base64
+
+try:
+    import orjson  # optional: much faster encode/decode for large listings
+except ImportError:
+    orjson = None
+
+try:
+    import pybase64  # optional: SIMD Base64 for large product images
+except ImportError:
+    pybase64 = None
+
+try:
+    import brotli  # optional: lets urllib3 decode Content-Encoding: br
+except ImportError:
+    brotli = None
 from typing import Dict, List, Optional, Any
 from .base import APIResponse, role_required
 from .enhanced_clients import EnhancedProductClient, RetailerMetricsClient, EnhancedSalesClient
 
-class APIResponse:
-    """Standardized API response wrapper"""
-    def __init__(self, success: bool, data: Any = None, error: str = None, status_code: int = None):
-        self.success = success
-        self.data = data
-        self.error = error
-        self.status_code = status_code
-    
-    def __bool__(self):
-        return self.success
-    
-    def __repr__(self):
-        if self.success:
-            return f"<APIResponse success=True data={type(self.data).__name__}>"
-        return f"<APIResponse success=False error='{self.error}'>"
+def _dumps(obj) -> bytes:
+    """Encode a request body (Content-Type is set on the session)"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode('utf-8')
 
 
-def role_required(*allowed_roles):
-    """
-    Decorator to enforce RBAC on client methods
-    Uses global current_session from utils.config
-    Usage: @role_required('Admin', 'Manager')
-    """
-    from utils.config import current_session
-    
-    def decorator(func):
-        @wraps(func)
-        def wrapper(self, *args, **kwargs):
-            if not current_session.is_authenticated():
-                return APIResponse(False, error="Not authenticated")
-            
-            user_role = current_session.role
-            if user_role not in allowed_roles:
-                return APIResponse(
-                    False,
-                    error=f"Access denied. Required roles: {', '.join(allowed_roles)}. Your role: {user_role}"
-                )
-            
-            # Update activity timestamp
-            current_session.update_activity()
-            
-            return func(self, *args, **kwargs)
-        return wrapper
-    return decorator
+def _b64encode(data: bytes) -> str:
+    """Base64-encode image bytes to str"""
+    if pybase64 is not None:
+        return pybase64.b64encode_as_string(data)
+    return base64.b64encode(data).decode('ascii')
+
+
+def _loads(content: bytes):
+    """Decode a response body; raises ValueError if it is not JSON"""
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
 
 
 class StockaDoodleAPI:
@@ -71,9 +66,30 @@ class StockaDoodleAPI:
         # Set custom User-Agent to identify as Desktop App
         self.headers = {
             'User-Agent': 'StockaDoodle-Desktop/1.0.0 (PyQt6)',
-            'Content-Type': 'application/json'
+            'Content-Type': 'application/json',
+            'Accept': 'application/json',
+            # The server compresses larger JSON bodies; urllib3 decodes them transparently
+            'Accept-Encoding': 'gzip, br' if brotli is not None else 'gzip, deflate'
         }
         
+        # One keep-alive connection pool for every call instead of a new TCP
+        # connection per request; idempotent requests retry briefly on failure.
+        # The adapter (urllib3's thread-safe PoolManager) is shared by all threads,
+        # so a connection opened by the startup health check is reused by the log
+        # worker and UI workers
+        self._adapter = HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=20,
+            max_retries=Retry(total=2, backoff_factor=0.2)
+        )
+        # requests.Session itself is not thread-safe (cookie jar, per-request
+        # state), so each thread gets a light Session over the shared adapter.
+        # It holds no sockets and is released with its thread's local storage
+        self._local = threading.local()
+        
+        # Worker pool for request_many(); created on first use
+        self._executor = None
+        
         # Initialize sub-clients
         self.users = UserClient(self)
         self.products = ProductClient(self)
@@ -86,38 +102,64 @@ class StockaDoodleAPI:
         self.retailer_metrics = RetailerMetricsClient(self)  
         self.sales_enhanced = EnhancedSalesClient(self)
     
+    def _new_session(self) -> requests.Session:
+        """Session with the client headers over the shared connection pool"""
+        session = requests.Session()
+        session.headers.update(self.headers)
+        session.mount('http://', self._adapter)
+        session.mount('https://', self._adapter)
+        return session
+    
+    @property
+    def session(self) -> requests.Session:
+        """The calling thread's session, created on first use"""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = self._new_session()
+        return session
+    
     def _url(self, path: str) -> str:
         """Build full URL from path"""
         return f"{self.base_url}/{path.lstrip('/')}"
     
-    def _request(self, method: str, path: str, json_data: Dict = None, params: Dict = None) -> APIResponse:
+    def _request(self, method: str, path: str, json_data: Dict = None, params: Dict = None,
+                 files: Dict = None) -> APIResponse:
         """
         Internal HTTP request handler with error handling
         Returns standardized APIResponse object
+        With `files`, sends multipart/form-data: json_data becomes the form fields
         """
         url = self._url(path)
         
+        if method not in ('GET', 'POST', 'PUT', 'DELETE'):
+            return APIResponse(False, error=f"Unsupported HTTP method: {method}")
+        
+        if files:
+            # Drop the session's JSON Content-Type so requests sets the multipart boundary
+            body = {'data': json_data, 'files': files, 'headers': {'Content-Type': None}}
+        elif method in ('POST', 'PUT') and json_data is not None:
+            body = {'data': _dumps(json_data)}
+        else:
+            body = {}
+        
         try:
-            if method == 'GET':
-                r = requests.get(url, params=params, headers=self.headers, timeout=self.timeout)
-            elif method == 'POST':
-                r = requests.post(url, json=json_data, headers=self.headers, timeout=self.timeout)
-            elif method == 'PUT':
-                r = requests.put(url, json=json_data, headers=self.headers, timeout=self.timeout)
-            elif method == 'DELETE':
-                r = requests.delete(url, headers=self.headers, timeout=self.timeout)
-            else:
-                return APIResponse(False, error=f"Unsupported HTTP method: {method}")
+            r = self.session.request(
+                method,
+                url,
+                params=params if method == 'GET' else None,
+                timeout=self.timeout,
+                **body
+            )
             
             # Try to parse JSON response
             try:
-                data = r.json()
+                data = _loads(r.content)
             except ValueError:
                 data = r.text
             
             # Success codes
             if 200 <= r.status_code < 300:
-                return APIResponse(True, data=data, status_code=r.status_code)
+                return APIResponse.ok(data, r.status_code)
             
             # Error codes
             error_msg = data.get('error', str(data)) if isinstance(data, dict) else str(data)
@@ -130,6 +172,39 @@ class StockaDoodleAPI:
         except Exception as e:
             return APIResponse(False, error=f"Unexpected error: {str(e)}")
     
+    def request_many(self, specs: List[tuple]) -> List[APIResponse]:
+        """
+        Issue independent requests concurrently; latency is the slowest call, not the sum
+        
+        Args:
+            specs: (method, path) or (method, path, json_data, params) tuples
+        
+        Returns:
+            APIResponse list in the same order as specs
+        """
+        if len(specs) <= 1:
+            return [self._request(*spec) for spec in specs]
+        
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='api-request')
+        futures = [self._executor.submit(self._request, *spec) for spec in specs]
+        return [f.result() for f in futures]
+    
+    def close(self):
+        """Release pooled connections and worker threads"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        # Closing the shared adapter drops every pooled connection; a Session
+        # still held by some thread's local storage owns nothing to release
+        self._adapter.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
     def login(self, username: str, password: str) -> APIResponse:
         """
         Authenticate user and store session
@@ -206,8 +281,12 @@ class UserClient:
 
 class ProductClient:
     """Product management API client"""
+    # Decoded images kept in memory, least recently used evicted first
+    IMAGE_CACHE_SIZE = 256
+    
     def __init__(self, api: StockaDoodleAPI):
         self.api = api
+        self._image_cache = OrderedDict()  # {product_id: bytes}
     
     def list(self, category_id: int = None, search: str = None, include_image: bool = False) -> APIResponse:
         """GET /products - List products with optional filters"""
@@ -226,19 +305,55 @@ class ProductClient:
         params = {'include_image': 'true'} if include_image else {}
         return self.api._request('GET', f'products/{product_id}', params=params)
     
+    def get_image(self, product_id: int) -> APIResponse:
+        """
+        GET /products/<id>/image - raw image bytes for one product
+        Lets list views skip include_image and load thumbnails only for visible rows
+        """
+        cached = self._image_cache.get(product_id)
+        if cached is not None:
+            self._image_cache.move_to_end(product_id)
+            return APIResponse.ok(cached)
+        
+        try:
+            r = self.api.session.get(self.api._url(f'products/{product_id}/image'),
+                                     timeout=self.api.timeout)
+        except requests.Timeout:
+            return APIResponse(False, error="Request timeout - server not responding")
+        except requests.ConnectionError:
+            return APIResponse(False, error="Connection failed - is the server running?")
+        
+        if r.status_code != 200:
+            try:
+                error = _loads(r.content).get('error', r.text)
+            except (ValueError, AttributeError):
+                error = r.text
+            return APIResponse(False, error=error, status_code=r.status_code)
+        
+        self._image_cache[product_id] = r.content
+        if len(self._image_cache) > self.IMAGE_CACHE_SIZE:
+            self._image_cache.popitem(last=False)
+        return APIResponse.ok(r.content)
+    
     @role_required('Admin', 'Manager')
     def create(self, name: str, price: float, **kwargs) -> APIResponse:
         """POST /products - Create new product"""
         data = {'name': name, 'price': price, **kwargs}
+        image_path = data.pop('image_path', None)
         
-        # Handle image file path -> Base64
-        if 'image_path' in kwargs and kwargs['image_path']:
+        # Upload the image file as raw multipart bytes: no Base64 inflation on
+        # either side. Falls back to JSON + Base64 for servers without the endpoint
+        if image_path:
             try:
-                with open(kwargs['image_path'], 'rb') as f:
-                    image_data = f.read()
-                    data['image_base64'] = base64.b64encode(image_data).decode('utf-8')
-                del data['image_path']
-            except Exception as e:
+                with open(image_path, 'rb') as f:
+                    form = {k: v for k, v in data.items() if v is not None}
+                    resp = self.api._request('POST', 'products/multipart', json_data=form,
+                                             files={'image': f})
+                    if resp.success or resp.status_code not in (404, 405):
+                        return resp
+                    f.seek(0)
+                    data['image_base64'] = _b64encode(f.read())
+            except OSError as e:
                 return APIResponse(False, error=f"Failed to read image: {e}")
         
         return self.api._request('POST', 'products', json_data=data)
@@ -252,17 +367,20 @@ class ProductClient:
         if 'image_path' in kwargs and kwargs['image_path']:
             try:
                 with open(kwargs['image_path'], 'rb') as f:
-                    image_data = f.read()
-                    data['image_base64'] = base64.b64encode(image_data).decode('utf-8')
+                    data['image_base64'] = _b64encode(f.read())
                 del data['image_path']
             except Exception as e:
                 return APIResponse(False, error=f"Failed to read image: {e}")
         
-        return self.api._request('PUT', f'products/{product_id}', json_data=data)
+        resp = self.api._request('PUT', f'products/{product_id}', json_data=data)
+        if resp.success:
+            self._image_cache.pop(product_id, None)
+        return resp
     
     @role_required('Admin', 'Manager')
     def delete(self, product_id: int) -> APIResponse:
         """DELETE /products/<id>"""
+        self._image_cache.pop(product_id, None)
         return self.api._request('DELETE', f'products/{product_id}')
 
 
@@ -382,6 +500,12 @@ class DashboardClient:
         """GET /dashboard/admin"""
         return self.api._request('GET', 'dashboard/admin')
     
+    @role_required('Admin')
+    def admin_overview(self, logs_limit: int = 10) -> APIResponse:
+        """GET /dashboard/admin/overview - KPIs plus recent desktop activity in one call"""
+        return self.api._request('GET', 'dashboard/admin/overview',
+                                 params={'logs_limit': logs_limit})
+    
     @role_required('Admin', 'Manager')
     def manager(self) -> APIResponse:
         """GET /dashboard/manager"""
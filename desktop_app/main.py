@@ -4,43 +4,126 @@ Initializes PyQt6 application and manages global state
 """
 import sys
 import os
+import json
+import time
 import logging
+import logging.handlers
+import queue
 import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from PyQt6.QtWidgets import QApplication, QMessageBox
 from PyQt6.QtCore import Qt, QTimer
 from utils.styles import get_global_stylesheet
 from dotenv import load_dotenv
 
-# Import necessary UI components
-from ui.login_window import LoginWindow # Assuming this file exists
-from ui.main_window import MainWindow   # Assuming this file exists
-# Imports for dashboard widgets are already here but are only used inside MainWindow
-from ui.admin_dashboard import AdminDashboardWidget
-from ui.manager_dashboard import ManagerDashboardWidget
-from ui.retailer_pos import RetailerPOSWidget
+# UI modules (MainWindow and the dashboards/login screens it pulls in) are
+# imported in run(), after the API health check, so a failed start never
+# pays for loading the widget tree
 
 
-# Setup logging before anything else
-def setup_logging():
-    """Configure application logging"""
+class _BufferedFileHandler(logging.FileHandler):
+    """
+    FileHandler with a 64 KB write buffer that does not flush per record;
+    the stream is flushed when the MemoryHandler in front of it flushes
+    """
+
+    def _open(self):
+        return open(self.baseFilename, self.mode, buffering=65536,
+                    encoding=self.encoding or 'utf-8', errors=self.errors)
+
+    def flush(self):
+        """Called by emit() after every record; deliberately a no-op"""
+
+    def flush_now(self):
+        """Write the stream buffer out to the file"""
+        super().flush()
+
+
+class _BatchMemoryHandler(logging.handlers.MemoryHandler):
+    """
+    MemoryHandler that flushes its target's stream once per batch, and at
+    least every flush_interval seconds so a hard crash loses little
+    """
+
+    def __init__(self, *args, flush_interval=2.0, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stop_flusher = threading.Event()
+        flusher = threading.Thread(target=self._flush_periodically, args=(flush_interval,),
+                                   daemon=True, name='log-flush')
+        flusher.start()
+
+    def _flush_periodically(self, interval):
+        while not self._stop_flusher.wait(interval):
+            if self.buffer:
+                self.flush()
+
+    def flush(self):
+        self.acquire()
+        try:
+            super().flush()
+            if isinstance(self.target, _BufferedFileHandler):
+                self.target.flush_now()
+            elif self.target:
+                self.target.flush()
+        finally:
+            self.release()
+
+    def close(self):
+        self._stop_flusher.set()
+        super().close()
+
+
+@lru_cache(maxsize=None)
+def _log_path() -> str:
+    """Log file path; the log directory is created on the first call only"""
     # Note: AppConfig must be importable for this function to work
     try:
         from utils.config import AppConfig
-        log_file = Path(AppConfig.LOG_DIR) / 'stockadoodle.log'
         # Ensure log directory exists
-        log_file.parent.mkdir(parents=True, exist_ok=True)
+        os.makedirs(AppConfig.LOG_DIR, exist_ok=True)
+        log_file = os.path.join(AppConfig.LOG_DIR, 'stockadoodle.log')
     except Exception as e:
         # Fallback if utils.config is not yet available
-        log_file = Path('.') / 'stockadoodle.log'
+        log_file = 'stockadoodle.log'
         print(f"Warning: Could not import AppConfig. Logging to local directory. Error: {e}")
+    return log_file
+
+
+# Setup logging before anything else
+def setup_logging():
+    """Configure application logging"""
+    log_file = _log_path()
+    # One Formatter shared by every handler that writes records out
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    # File records are buffered and written in batches; WARNING and above flush
+    # immediately, the rest at least every 2 s, and logging.shutdown() at exit
+    file_handler = _BufferedFileHandler(log_file)
+    # Set on the target itself: the MemoryHandler in front of it never formats
+    file_handler.setFormatter(formatter)
+    buffered_file_handler = _BatchMemoryHandler(
+        capacity=1024,
+        flushLevel=logging.WARNING,
+        target=file_handler,
+        flushOnClose=True,
+        flush_interval=2.0
+    )
+
+    # The format uses none of these; skip the per-record thread/process lookups
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setFormatter(formatter)
 
     logging.basicConfig(
         level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
         handlers=[
-            logging.FileHandler(log_file),
-            logging.StreamHandler(sys.stdout)
+            buffered_file_handler,
+            console_handler
         ]
     )
 
@@ -51,8 +134,11 @@ def setup_logging():
     return logging.getLogger('stockadoodle.main')
 
 
-# Load environment variables
-load_dotenv()
+# Load environment variables from desktop_app/.env, if there is one
+# (a single stat instead of find_dotenv's walk up the directory tree)
+_env_file = Path(__file__).parent / '.env'
+if _env_file.is_file():
+    load_dotenv(_env_file, override=False)
 
 # Initialize logging
 logger = setup_logging()
@@ -82,6 +168,13 @@ class StockaDoodleApp:
         
         # Main application window
         self.main_window = None
+        
+        # Desktop action logs are sent by one background worker, in batches
+        self._log_queue = queue.Queue()
+        self._log_worker = threading.Thread(
+            target=self._send_desktop_logs, name='desktop-log-sender', daemon=True
+        )
+        self._log_worker.start()
 
 
     def initialize_qt(self):
@@ -95,12 +188,13 @@ class StockaDoodleApp:
 
         # Create QApplication
         self.qt_app = QApplication(sys.argv)
-        self.qt_app.setStyleSheet(get_global_stylesheet())
         self.qt_app.setApplicationName("StockaDoodle IMS")
         self.qt_app.setApplicationVersion("1.0.0")
 
-        # Set application style
+        # Set application style before the stylesheet, so the stylesheet
+        # style is built once on top of Fusion rather than rebuilt
         self.qt_app.setStyle('Fusion')  # Modern cross-platform style
+        self.qt_app.setStyleSheet(get_global_stylesheet())
 
         logger.info("Qt application initialized")
 
@@ -146,27 +240,53 @@ class StockaDoodleApp:
         
         self.session = current_session
 
-        # Setup session timeout checker
+        # Setup session timeout checker: a single-shot timer armed for the
+        # moment the session would expire, instead of polling every minute
         self.session_timer = QTimer()
+        self.session_timer.setSingleShot(True)
         self.session_timer.timeout.connect(self._check_session_timeout)
-        # Check every minute (60000 ms)
-        self.session_timer.start(60000)
+        self._schedule_timeout_check()
 
         logger.info("Session manager initialized")
 
+    def _schedule_timeout_check(self):
+        """
+        Arm the session timer for when the session expires if there is no
+        further activity; with no session, check again one timeout period later
+        (covers logins that don't go through handle_login)
+        """
+        if not self.session_timer:
+            return
+
+        if self.session.is_authenticated():
+            # One second of slack so the session is past its timeout when the check runs
+            remaining_ms = int(self.session.seconds_until_expiry() * 1000) + 1000
+        else:
+            from utils.config import AppConfig
+            remaining_ms = AppConfig.SESSION_TIMEOUT_MINUTES * 60000
+        self.session_timer.start(remaining_ms)
+
     def _check_session_timeout(self):
         """Check if session has expired and handle accordingly"""
-        if self.session.is_authenticated() and self.session.is_session_expired():
-            logger.warning(f"Session expired for user: {self.session.username}")
+        if not self.session.is_authenticated():
+            self._schedule_timeout_check()
+            return
 
-            # Notify the user via the main application window
-            if self.main_window:
-                self.show_error_dialog(
-                    "Session Expired",
-                    "Your session has expired due to inactivity. Please log in again."
-                )
-            
-            self.handle_logout() # Clears session and navigates to login screen
+        if not self.session.is_session_expired():
+            # Activity since the timer was armed pushed expiry back
+            self._schedule_timeout_check()
+            return
+
+        logger.warning(f"Session expired for user: {self.session.username}")
+
+        # Notify the user via the main application window
+        if self.main_window:
+            self.show_error_dialog(
+                "Session Expired",
+                "Your session has expired due to inactivity. Please log in again."
+            )
+        
+        self.handle_logout() # Clears session and navigates to login screen
 
     def handle_login(self, username: str, password: str) -> bool:
         """
@@ -189,6 +309,7 @@ class StockaDoodleApp:
                 # Store session
                 self.session.login(resp.data)
                 logger.info(f"Login successful for {username} ({self.session.role})")
+                self._schedule_timeout_check()
 
                 # Log login activity
                 self.log_desktop_action('LOGIN', 'user', username)
@@ -215,6 +336,7 @@ class StockaDoodleApp:
         # Clear session
         self.session.logout()
         self.api_client.logout()
+        self._schedule_timeout_check()
 
         # Navigate to login screen
         if self.main_window:
@@ -229,16 +351,18 @@ class StockaDoodleApp:
             target_entity: Entity type (user, product, category, sale)
             target_name: Optional name/identifier of target
         """
-        if not self.session.is_authenticated():
+        authenticated = self.session.is_authenticated()
+        if not authenticated:
             # Allow 'LOGIN' action logging even if session isn't fully set up yet
             if action_type != 'LOGIN':
                  return
 
         try:
             # Determine user info for logging
-            user_id = self.session.user_id if self.session.is_authenticated() else 'anonymous'
-            username = self.session.username if self.session.is_authenticated() else target_name
-            role = self.session.role if self.session.is_authenticated() else 'N/A'
+            if authenticated:
+                user_id, username, role = self.session.user_id, self.session.username, self.session.role
+            else:
+                user_id, username, role = 'anonymous', target_name, 'N/A'
             
             action_data = {
                 'user_id': user_id,
@@ -250,42 +374,119 @@ class StockaDoodleApp:
                 'source': 'Desktop App'
             }
 
-            # Send to backend (non-blocking, fire and forget)
-            def send_log():
+            # Send to backend (non-blocking: the log worker picks it up)
+            self._log_queue.put(action_data)
+
+            # %-style: the dict is only formatted if a DEBUG record is emitted
+            logger.debug("Desktop action logged: %r", action_data)
+
+        except Exception as e:
+            logger.error(f"Failed to log desktop action: {e}")
+
+    # A log batch is sent once it holds this many actions or bytes of JSON,
+    # LOG_FLUSH_INTERVAL seconds after its first action, or on logout
+    LOG_BATCH_SIZE = 50
+    LOG_BATCH_BYTES = 8192
+    LOG_FLUSH_INTERVAL = 2.0
+
+    def _send_desktop_logs(self):
+        """
+        Log worker: accumulates queued actions and sends them as one batch
+        per the size/time policy above. A None item flushes and stops the worker
+        """
+        running = True
+        while running:
+            first = self._log_queue.get()
+            if first is None:
+                break
+
+            batch = [first]
+            batch_bytes = len(json.dumps(first))
+            deadline = time.monotonic() + self.LOG_FLUSH_INTERVAL
+            flush_now = first.get('action_type') == 'LOGOUT'
+
+            while (not flush_now and len(batch) < self.LOG_BATCH_SIZE
+                   and batch_bytes < self.LOG_BATCH_BYTES):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
                 try:
-                    # _request method in StockaDoodleAPI should handle non-blocking nature
+                    item = self._log_queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    running = False
+                    break
+                batch.append(item)
+                batch_bytes += len(json.dumps(item))
+                flush_now = item.get('action_type') == 'LOGOUT'
+
+            self._post_desktop_logs(batch)
+
+    def _post_desktop_logs(self, batch: list):
+        """POST one batch of desktop actions"""
+        try:
+            resp = self.api_client._request('POST', 'log/desktop/batch', json_data=batch)
+            if resp.status_code in (404, 405):
+                # Older servers only have the single-action endpoint
+                for action_data in batch:
                     self.api_client._request('POST', 'log/desktop', json_data=action_data)
-                except Exception as e:
-                    logger.error(f"Failed to send desktop log: {e}")
+            elif not resp.success:
+                logger.error(f"Failed to send desktop logs: {resp.error}")
+        except Exception as e:
+            logger.error(f"Failed to send desktop logs: {e}")
 
-            thread = threading.Thread(target=send_log, daemon=True)
-            thread.start()
+    def _stop_log_worker(self, timeout: float = 2.0):
+        """Flush queued desktop logs and stop the log worker"""
+        if self._log_worker.is_alive():
+            self._log_queue.put(None)
+            self._log_worker.join(timeout)
 
-            logger.debug(f"Desktop action logged: {action_data}")
+    def _message_box(self, icon: QMessageBox.Icon) -> QMessageBox:
+        """
+        Reusable message box per icon, created on first use; rebuilt only if
+        the parent changes (i.e. once the MainWindow exists)
+        """
+        if not hasattr(self, '_message_boxes'):
+            self._message_boxes = {}
 
-        except Exception as e:
-            logger.error(f"Failed to log desktop action: {e}")
+        parent_widget = self.main_window if self.main_window else None
+        box = self._message_boxes.get(icon)
+        if box is None or box.parent() is not parent_widget:
+            box = QMessageBox(parent_widget)
+            box.setIcon(icon)
+            box.setStandardButtons(QMessageBox.StandardButton.Ok)
+            self._message_boxes[icon] = box
+        return box
+
+    def _show_message(self, icon: QMessageBox.Icon, title: str, message: str):
+        """Show a modal message box. If MainWindow exists, it is the parent."""
+        box = self._message_box(icon)
+        box.setWindowTitle(title)
+        box.setText(message)
+        box.exec()
 
     def show_error_dialog(self, title: str, message: str):
         """Show error dialog to user. If MainWindow exists, set it as parent."""
-        parent_widget = self.main_window if self.main_window else None
-        QMessageBox.critical(parent_widget, title, message)
+        self._show_message(QMessageBox.Icon.Critical, title, message)
         logger.error(f"Error dialog shown: {title} - {message}")
 
     def show_info_dialog(self, title: str, message: str):
         """Show info dialog to user. If MainWindow exists, set it as parent."""
-        parent_widget = self.main_window if self.main_window else None
-        QMessageBox.information(parent_widget, title, message)
+        self._show_message(QMessageBox.Icon.Information, title, message)
         logger.info(f"Info dialog shown: {title} - {message}")
 
     def run(self):
         """Run the application"""
         try:
-            # 1. Initialize Qt environment
-            self.initialize_qt()
-
-            # 2. Initialize API Client and check connectivity
-            if not self.initialize_api_client():
+            # 1. Initialize API Client and check connectivity on a worker thread
+            #    (no Qt involved) while 2. the Qt environment is initialized
+            with ThreadPoolExecutor(max_workers=1, thread_name_prefix='startup') as pool:
+                api_ready = pool.submit(self.initialize_api_client)
+                self.initialize_qt()
+                connected = api_ready.result()
+
+            if not connected:
                 self.show_error_dialog(
                     "Connection Error",
                     "Could not connect to StockaDoodle server.\nPlease ensure the API server is running."
@@ -296,6 +497,7 @@ class StockaDoodleApp:
             self.initialize_session()
 
             # 4. Instantiate and configure the Main Application Window
+            from ui.main_window import MainWindow
             self.main_window = MainWindow(app_controller=self)
             
             # Since the application starts unauthenticated, the MainWindow
@@ -308,7 +510,7 @@ class StockaDoodleApp:
             return self.qt_app.exec()
 
         except Exception as e:
-            logger.error(f"Application crash error: {e}", exc_info=True)
+            logger.exception("Application crash error: %s", e)
             self.show_error_dialog(
                 "Application Crash",
                 f"An unexpected and critical error occurred:\n{str(e)}"
@@ -328,8 +530,15 @@ class StockaDoodleApp:
             # Stop the session timer
             if self.session_timer:
                 self.session_timer.stop()
+            
+            # Send queued desktop logs, then release pooled HTTP connections
+            if self.api_client:
+                self._stop_log_worker()
+                self.api_client.close()
 
             logger.info("Application shutdown")
+            for handler in logging.getLogger().handlers:
+                handler.flush()
 
 
 def main():
@@ -344,6 +553,4 @@ def main():
 
 
 if __name__ == '__main__':
-    # Ensure threading is imported for use in log_desktop_action
-    import threading 
     main()
\ No newline at end of file
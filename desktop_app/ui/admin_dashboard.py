@@ -5,19 +5,178 @@ High-level metrics, user activity, and quick actions
 
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
-    QTableWidget, QTableWidgetItem, QFrame, QGridLayout, QHeaderView
+    QTableView, QFrame, QGridLayout, QHeaderView
     
 )
 from desktop_app.ui.user_profile import UserProfileTab
-from PyQt6.QtCore import Qt, QTimer, QSize
-from PyQt6.QtGui import QFont
+from PyQt6.QtCore import (
+    Qt, QTimer, QSize, QAbstractTableModel, QModelIndex,
+    QObject, QRunnable, QThreadPool, pyqtSignal
+)
+from PyQt6.QtGui import QFont, QFontMetrics, QIcon, QPixmap
 from datetime import datetime
+from typing import Any, Callable, Dict, Tuple
+import threading
+import time
 
 from api_client.stockadoodle_api import StockaDoodleAPI
-from utils.config import AppConfig
+from api_client.base import APIResponse
+from utils.config import AppConfig, current_session
 from utils.decorators import role_required
 from utils.helpers import get_feather_icon
-from utils.styles import get_dashboard_card_style, apply_table_styles
+from utils.styles import apply_table_styles
+
+
+# Dashboard API responses reused across dashboard opens: {key: (fetched_at, response)}
+_CACHE: Dict[str, Tuple[float, Any]] = {}
+# Read from the UI thread and written from thread-pool workers; _CACHE_LOCK
+# guards the dicts, and a per-key lock keeps concurrent workers (refresh ticks
+# racing a manual load) from fetching the same key twice
+_CACHE_LOCK = threading.Lock()
+_CACHE_KEY_LOCKS: Dict[str, threading.Lock] = {}
+
+KPI_TTL = 120  # seconds; product/user/sale totals move slowly
+LOGS_TTL = 30
+
+# Auto-refresh while visible: the interval doubles each time the data comes
+# back unchanged, up to the cap, and resets once it changes
+REFRESH_INTERVAL_MS = 30_000
+REFRESH_MAX_INTERVAL_MS = 300_000
+
+# Stylesheets: AppConfig colors are constants, so these are formatted once at
+# import; per-color variants are formatted once per color and then reused
+_KPI_CARD_QSS_TEMPLATE = """
+    QFrame {{
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:1,
+            stop:0 {c}22, stop:1 {c}44);
+        border: 1px solid {c}44;
+        border-radius: 12px;
+        padding: 20px;
+        min-height: 120px;
+    }}
+"""
+_ACTION_BUTTON_QSS_TEMPLATE = """
+    QPushButton {{
+        background-color: {c};
+        color: white;
+        border: none;
+        border-radius: 8px;
+        padding: 15px;
+        font-size: 12pt;
+        font-weight: bold;
+        text-align: left;
+    }}
+    QPushButton:hover {{
+        background-color: {c}dd;
+    }}
+"""
+_WELCOME_HEADER_QSS = f"""
+    QFrame {{
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
+            stop:0 {AppConfig.PRIMARY_COLOR}, stop:1 {AppConfig.SECONDARY_COLOR});
+        border-radius: 12px;
+        padding: 20px;
+    }}
+"""
+_SECTION_QSS = f"""
+    QFrame {{
+        background-color: {AppConfig.CARD_BACKGROUND};
+        border-radius: 12px;
+        padding: 20px;
+    }}
+"""
+# Icon pixmaps for KPI cards and action buttons: {(name, color, size): QPixmap}
+_PIXMAP_CACHE: Dict[Tuple[str, str, int], QPixmap] = {}
+_KPI_QSS_CACHE: Dict[str, str] = {}
+_ACTION_BUTTON_QSS_CACHE: Dict[str, str] = {}
+
+
+def _icon_pixmap(name: str, color: str, size: int) -> QPixmap:
+    """Feather icon rendered to a size x size pixmap, once per (name, color, size)"""
+    key = (name, color, size)
+    pixmap = _PIXMAP_CACHE.get(key)
+    if pixmap is None:
+        pixmap = _PIXMAP_CACHE[key] = get_feather_icon(name, color, size).pixmap(QSize(size, size))
+    return pixmap
+
+
+def _kpi_card_qss(color: str) -> str:
+    qss = _KPI_QSS_CACHE.get(color)
+    if qss is None:
+        qss = _KPI_QSS_CACHE[color] = _KPI_CARD_QSS_TEMPLATE.format(c=color)
+    return qss
+
+
+def _action_button_qss(color: str) -> str:
+    qss = _ACTION_BUTTON_QSS_CACHE.get(color)
+    if qss is None:
+        qss = _ACTION_BUTTON_QSS_CACHE[color] = _ACTION_BUTTON_QSS_TEMPLATE.format(c=color)
+    return qss
+
+
+def _cache_get(key: str):
+    """(fetched_at, response) for key, or None"""
+    with _CACHE_LOCK:
+        return _CACHE.get(key)
+
+
+def cached_call(key: str, ttl: float, fn: Callable[[], Any]) -> Any:
+    """
+    Return the cached result of fn() if it is younger than ttl seconds,
+    otherwise call fn() and cache a successful result
+    If the call raises or fails, the stale entry (if any) is served instead
+    Safe to call from worker threads
+    """
+    with _CACHE_LOCK:
+        key_lock = _CACHE_KEY_LOCKS.setdefault(key, threading.Lock())
+    
+    # A worker that waited here finds the entry the first one just stored
+    with key_lock:
+        now = time.monotonic()
+        entry = _cache_get(key)
+        if entry and now - entry[0] < ttl:
+            return entry[1]
+        
+        try:
+            result = fn()
+        except Exception:
+            if entry:
+                return entry[1]
+            raise
+        
+        if getattr(result, 'success', True):
+            with _CACHE_LOCK:
+                _CACHE[key] = (now, result)
+        elif entry:
+            return entry[1]
+        return result
+
+
+def _call_or_error(fn: Callable[[], Any]) -> Any:
+    """fn(), with an exception turned into a failed APIResponse"""
+    try:
+        return fn()
+    except Exception as e:
+        return APIResponse(False, error=str(e))
+
+
+class _ApiWorkerSignals(QObject):
+    """Signals for _ApiWorker (QRunnable is not a QObject)"""
+    result = pyqtSignal(object)
+
+
+class _ApiWorker(QRunnable):
+    """
+    Runs one blocking API call on a QThreadPool thread and emits the response
+    Exceptions are emitted as a failed APIResponse
+    """
+    def __init__(self, fn: Callable[[], Any]):
+        super().__init__()
+        self.fn = fn
+        self.signals = _ApiWorkerSignals()
+    
+    def run(self):
+        self.signals.result.emit(_call_or_error(self.fn))
 
 
 class KPICard(QFrame):
@@ -27,16 +186,7 @@ class KPICard(QFrame):
         self.title = title
         self.color = color
         
-        self.setStyleSheet(f"""
-            QFrame {{
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:1,
-                    stop:0 {color}22, stop:1 {color}44);
-                border: 1px solid {color}44;
-                border-radius: 12px;
-                padding: 20px;
-                min-height: 120px;
-            }}
-        """)
+        self.setStyleSheet(_kpi_card_qss(color))
         
         layout = QVBoxLayout(self)
         layout.setSpacing(10)
@@ -45,7 +195,7 @@ class KPICard(QFrame):
         header = QHBoxLayout()
         
         icon_label = QLabel()
-        icon_label.setPixmap(get_feather_icon(icon_name, "white", 24).pixmap(QSize(24, 24)))
+        icon_label.setPixmap(_icon_pixmap(icon_name, "white", 24))
         header.addWidget(icon_label)
         
         title_label = QLabel(title)
@@ -66,23 +216,102 @@ class KPICard(QFrame):
         self.value_label.setText(str(value))
 
 
+def _fast_log_time(ts: str) -> str:
+    """
+    'YYYY-MM-DDTHH:MM...' -> 'HH:MM AM/PM' (same output as strftime("%I:%M %p"))
+    Slices the known ISO shape; anything else goes through fromisoformat
+    """
+    if (isinstance(ts, str) and len(ts) >= 16 and ts[4] == '-' and ts[10] in ('T', ' ')
+            and ts[13] == ':' and ts[11:13].isdigit() and ts[14:16].isdigit()):
+        hh = int(ts[11:13])
+        if hh < 24:
+            return f"{hh % 12 or 12:02d}:{ts[14:16]} {'AM' if hh < 12 else 'PM'}"
+    try:
+        return datetime.fromisoformat(ts).strftime("%I:%M %p")
+    except (TypeError, ValueError):
+        return str(ts)[:10]
+
+
+class ActivityLogModel(QAbstractTableModel):
+    """
+    Table model over the raw activity log dicts
+    The view asks for visible cells only; no per-cell item objects are built
+    """
+    HEADERS = ("User", "Action", "Target", "Time")
+    
+    def __init__(self, logs=None, parent=None):
+        super().__init__(parent)
+        self._rows = []
+        if logs:
+            self.setLogs(logs)
+    
+    def setLogs(self, logs: list):
+        """Replace the model contents; display strings are computed once here"""
+        self.beginResetModel()
+        self._rows = [
+            (
+                log.get('username', 'System'),
+                log.get('action', 'N/A'),
+                log.get('target', 'N/A'),
+                self._format_time(log.get('timestamp', ''))
+            )
+            for log in logs
+        ]
+        self.endResetModel()
+    
+    @staticmethod
+    def _format_time(timestamp) -> str:
+        """Format timestamp nicely"""
+        if not timestamp:
+            return 'N/A'
+        return _fast_log_time(timestamp)
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+    
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+    
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and index.isValid():
+            return self._rows[index.row()][index.column()]
+        return None
+    
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+
 class AdminDashboardWidget(QWidget):
     """Main Admin Dashboard - System Overview"""
     
     def __init__(self, api_client: StockaDoodleAPI, parent=None):
         super().__init__(parent)
         self.api = api_client
+        self._workers = set()  # in-flight _ApiWorkers, kept alive until they report
         
         self.setStyleSheet(f"background-color: {AppConfig.BACKGROUND_COLOR};")
         self.user_data = user_data
         self.setWindowTitle(f"Stockadoodle - Admin Dashboard ({user_data['username']})")
+        self._sections_built = False
+        self._last_overview = None
+        # Last response object handled per cache key; cache replays hand back the
+        # same object, so only a different one is news from the server
+        self._seen_responses: Dict[str, Any] = {}
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.timeout.connect(self._poll_dashboard)
         self.init_ui()
         
-        # Load data asynchronously
-        QTimer.singleShot(100, self.load_dashboard_data)
+        # Sections and data are loaded on first show (see showEvent)
         
     def init_ui(self):
-        """Initialize the UI layout"""
+        """
+        Initialize the UI layout
+        Only the header and empty section hosts are created here; the KPI,
+        activity and quick-action sections are built the first time the
+        dashboard is shown
+        """
         main_layout = QVBoxLayout(self)
         main_layout.setContentsMargins(25, 25, 25, 25)
         main_layout.setSpacing(20)
@@ -92,35 +321,56 @@ class AdminDashboardWidget(QWidget):
         main_layout.addWidget(header)
         
         # KPI Cards Row
-        kpi_layout = self._create_kpi_section()
-        main_layout.addLayout(kpi_layout)
+        self._kpi_host = QWidget()
+        main_layout.addWidget(self._kpi_host)
         
         # Content Split: Activity (60%) + Quick Actions (40%)
         content_layout = QHBoxLayout()
         content_layout.setSpacing(20)
         
         # Left: Recent Activity
-        activity_section = self._create_activity_section()
-        content_layout.addWidget(activity_section, 60)
+        self._activity_host = QWidget()
+        content_layout.addWidget(self._activity_host, 60)
         
         # Right: Quick Actions
-        actions_section = self._create_quick_actions()
-        content_layout.addWidget(actions_section, 40)
+        self._actions_host = QWidget()
+        content_layout.addWidget(self._actions_host, 40)
         
         main_layout.addLayout(content_layout)
         main_layout.addStretch()
         
+    def _build_sections(self):
+        """Build the deferred sections into their host widgets (once)"""
+        self._sections_built = True
+        
+        kpi_layout = self._create_kpi_section()
+        kpi_layout.setContentsMargins(0, 0, 0, 0)
+        self._kpi_host.setLayout(kpi_layout)
+        
+        for host, section in ((self._activity_host, self._create_activity_section()),
+                              (self._actions_host, self._create_quick_actions())):
+            host_layout = QVBoxLayout(host)
+            host_layout.setContentsMargins(0, 0, 0, 0)
+            host_layout.addWidget(section)
+        
+    def showEvent(self, event):
+        """Build the sections on first display; (re)load and resume auto-refresh on every show"""
+        if not self._sections_built:
+            self._build_sections()
+        # Load data asynchronously
+        QTimer.singleShot(100, self.load_dashboard_data)
+        self._refresh_timer.start(REFRESH_INTERVAL_MS)
+        super().showEvent(event)
+        
+    def hideEvent(self, event):
+        """Hidden dashboards don't poll"""
+        self._refresh_timer.stop()
+        super().hideEvent(event)
+        
     def _create_welcome_header(self) -> QFrame:
         """Create the welcome banner"""
         header = QFrame()
-        header.setStyleSheet(f"""
-            QFrame {{
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
-                    stop:0 {AppConfig.PRIMARY_COLOR}, stop:1 {AppConfig.SECONDARY_COLOR});
-                border-radius: 12px;
-                padding: 20px;
-            }}
-        """)
+        header.setStyleSheet(_WELCOME_HEADER_QSS)
         
         layout = QVBoxLayout(header)
         
@@ -157,13 +407,7 @@ class AdminDashboardWidget(QWidget):
     def _create_activity_section(self) -> QFrame:
         """Create recent activity log section"""
         section = QFrame()
-        section.setStyleSheet(f"""
-            QFrame {{
-                background-color: {AppConfig.CARD_BACKGROUND};
-                border-radius: 12px;
-                padding: 20px;
-            }}
-        """)
+        section.setStyleSheet(_SECTION_QSS)
         
         layout = QVBoxLayout(section)
         
@@ -173,17 +417,21 @@ class AdminDashboardWidget(QWidget):
         title.setStyleSheet("color: white; margin-bottom: 10px;")
         layout.addWidget(title)
         
-        # Activity Table
-        self.activity_table = QTableWidget(0, 4)
-        self.activity_table.setHorizontalHeaderLabels(["User", "Action", "Target", "Time"])
+        # Activity Table (model/view: rows are painted from the model on demand)
+        self.activity_model = ActivityLogModel(parent=self)
+        self.activity_table = QTableView()
+        self.activity_table.setModel(self.activity_model)
         apply_table_styles(self.activity_table)
         
-        # Configure columns
+        # Configure columns: fixed starting widths from font metrics instead of
+        # ResizeToContents, which re-measures every row on each model reset
         header = self.activity_table.horizontalHeader()
-        header.setSectionResizeMode(0, QHeaderView.ResizeMode.ResizeToContents)
-        header.setSectionResizeMode(1, QHeaderView.ResizeMode.ResizeToContents)
+        fm = QFontMetrics(self.activity_table.font())
+        for col, sample in ((0, "MMMMMMMMMM"), (1, "MMMMMMMM"), (3, "00:00 MM")):
+            header.setSectionResizeMode(col, QHeaderView.ResizeMode.Interactive)
+            header.resizeSection(col, fm.horizontalAdvance(sample))
         header.setSectionResizeMode(2, QHeaderView.ResizeMode.Stretch)
-        header.setSectionResizeMode(3, QHeaderView.ResizeMode.ResizeToContents)
+        self._activity_columns_sized = False
         
         self.activity_table.setMinimumHeight(400)
         layout.addWidget(self.activity_table)
@@ -193,13 +441,7 @@ class AdminDashboardWidget(QWidget):
     def _create_quick_actions(self) -> QFrame:
         """Create quick action buttons section"""
         section = QFrame()
-        section.setStyleSheet(f"""
-            QFrame {{
-                background-color: {AppConfig.CARD_BACKGROUND};
-                border-radius: 12px;
-                padding: 20px;
-            }}
-        """)
+        section.setStyleSheet(_SECTION_QSS)
         
         layout = QVBoxLayout(section)
         
@@ -245,77 +487,160 @@ class AdminDashboardWidget(QWidget):
     def _create_action_button(self, text: str, icon: str, color: str) -> QPushButton:
         """Create a styled action button"""
         btn = QPushButton(text)
-        btn.setIcon(get_feather_icon(icon, "white", 20))
+        btn.setIcon(QIcon(_icon_pixmap(icon, "white", 20)))
         btn.setIconSize(QSize(20, 20))
         btn.setMinimumHeight(80)
-        btn.setStyleSheet(f"""
-            QPushButton {{
-                background-color: {color};
-                color: white;
-                border: none;
-                border-radius: 8px;
-                padding: 15px;
-                font-size: 12pt;
-                font-weight: bold;
-                text-align: left;
-            }}
-            QPushButton:hover {{
-                background-color: {color}dd;
-            }}
-        """)
+        btn.setStyleSheet(_action_button_qss(color))
         return btn
         
     @role_required('Admin')
     def load_dashboard_data(self):
         """Load dashboard data from API"""
-        try:
-            # Fetch admin dashboard metrics
-            resp = self.api.dashboard.admin()
-            
-            if resp.success:
-                data = resp.data
-                self.products_card.set_value(data.get('total_products', 0))
-                self.users_card.set_value(data.get('total_users', 0))
-                self.sales_card.set_value(data.get('total_sales', 0))
-            
-            # Fetch recent activity logs
-            logs_resp = self.api.logs.desktop.get_recent(limit=10)
-            
-            if logs_resp.success:
-                self._populate_activity_table(logs_resp.data)
-                
-        except Exception as e:
-            print(f"Error loading dashboard data: {e}")
+        self._fetch_dashboard_data()
+    
+    def _poll_dashboard(self):
+        """
+        Refresh-timer tick. Polls are not user activity: they must not keep the
+        session alive, and they stop once the session is gone or idle too long
+        """
+        if not current_session.is_admin() or current_session.is_session_expired():
+            self._refresh_timer.stop()
+            return
+        self._fetch_dashboard_data(background=True)
+    
+    def _fetch_dashboard_data(self, background: bool = False):
+        """
+        Cached responses are painted immediately; the API calls run on the
+        global thread pool and update the widgets when they return
+        background: the call was not user-initiated (see role_required)
+        """
+        if not self._sections_built:
+            # Nothing to fill yet; showEvent calls this once the sections exist
+            return
+        
+        cached = _cache_get('admin_overview')
+        if cached:
+            # Repaint only: marked seen so it never counts towards the backoff
+            self._seen_responses['admin_overview'] = cached[1]
+            self._on_overview_loaded(cached[1])
+        
+        # Poll ticks always go to the server; a cached reply would look unchanged
+        ttl = 0 if background else LOGS_TTL
+        
+        # KPIs and recent activity in one round trip
+        self._start_worker(
+            lambda: cached_call(
+                'admin_overview', ttl,
+                lambda: self.api.dashboard.admin_overview(logs_limit=10, background=background)
+            ),
+            lambda resp: self._on_overview_loaded(resp, background)
+        )
+    
+    def _load_separately(self, background: bool = False):
+        """
+        Fallback for servers without /dashboard/admin/overview: one call per section
+        Always a follow-up to an overview request, so it doesn't count as activity again
+        """
+        cached_kpi = _cache_get('admin_kpi')
+        if cached_kpi:
+            self._seen_responses['admin_kpi'] = cached_kpi[1]
+            self._on_kpi_loaded(cached_kpi[1])
+        cached_logs = _cache_get('recent_logs_10')
+        if cached_logs:
+            self._seen_responses['recent_logs_10'] = cached_logs[1]
+            self._on_logs_loaded(cached_logs[1])
+        
+        kpi_ttl, logs_ttl = (0, 0) if background else (KPI_TTL, LOGS_TTL)
+        
+        # Both sections in one worker so the backoff sees them together
+        self._start_worker(
+            lambda: (
+                _call_or_error(lambda: cached_call(
+                    'admin_kpi', kpi_ttl,
+                    lambda: self.api.dashboard.admin(background=True)
+                )),
+                _call_or_error(lambda: cached_call(
+                    'recent_logs_10', logs_ttl,
+                    lambda: self.api.logs.desktop.get_recent(limit=10)
+                ))
+            ),
+            self._on_sections_loaded
+        )
+    
+    def _start_worker(self, fn: Callable[[], Any], slot: Callable[[Any], None]):
+        """Run fn on the global thread pool and deliver its result to slot on the UI thread"""
+        worker = _ApiWorker(fn)
+        self._workers.add(worker)
+        worker.signals.result.connect(slot)
+        worker.signals.result.connect(lambda _, w=worker: self._workers.discard(w))
+        QThreadPool.globalInstance().start(worker)
+    
+    def _is_new_response(self, key: str, resp) -> bool:
+        """True the first time this response object is handled for key"""
+        if self._seen_responses.get(key) is resp:
+            return False
+        self._seen_responses[key] = resp
+        return True
+    
+    def _on_overview_loaded(self, resp, background: bool = False):
+        """Update KPI cards and the activity table from an admin overview response"""
+        if resp.success:
+            if self._is_new_response('admin_overview', resp):
+                self._adjust_refresh_interval(resp.data)
+            self._on_kpi_loaded(APIResponse.ok(resp.data.get('kpi', {})))
+            self._on_logs_loaded(APIResponse.ok(resp.data.get('recent_logs', [])))
+        elif resp.status_code in (404, 405):
+            self._load_separately(background)
+        else:
+            print(f"Error loading dashboard data: {resp.error}")
+    
+    def _on_sections_loaded(self, responses):
+        """Fallback path: KPI and recent-logs responses fetched by one worker"""
+        kpi_resp, logs_resp = responses
+        # Both checks must run so each key records its latest response
+        kpi_new = self._is_new_response('admin_kpi', kpi_resp)
+        logs_new = self._is_new_response('recent_logs_10', logs_resp)
+        if (kpi_new or logs_new) and kpi_resp.success and logs_resp.success:
+            self._adjust_refresh_interval({'kpi': kpi_resp.data, 'recent_logs': logs_resp.data})
+        self._on_kpi_loaded(kpi_resp)
+        self._on_logs_loaded(logs_resp)
+    
+    def _adjust_refresh_interval(self, data):
+        """
+        Back the refresh timer off while the server's data is unchanged; reset on change
+        Only called with responses actually fetched from the server
+        """
+        if data == self._last_overview:
+            interval = min(self._refresh_timer.interval() * 2, REFRESH_MAX_INTERVAL_MS)
+        else:
+            interval = REFRESH_INTERVAL_MS
+        self._last_overview = data
+        if self._refresh_timer.isActive() and interval != self._refresh_timer.interval():
+            self._refresh_timer.start(interval)
+    
+    def _on_kpi_loaded(self, resp):
+        """Update the KPI cards from an admin dashboard response"""
+        if resp.success:
+            data = resp.data
+            self.products_card.set_value(data.get('total_products', 0))
+            self.users_card.set_value(data.get('total_users', 0))
+            self.sales_card.set_value(data.get('total_sales', 0))
+        else:
+            print(f"Error loading dashboard data: {resp.error}")
+    
+    def _on_logs_loaded(self, resp):
+        """Fill the activity table from a recent-logs response"""
+        if resp.success:
+            self._populate_activity_table(resp.data)
+        else:
+            print(f"Error loading dashboard data: {resp.error}")
             
     def _populate_activity_table(self, logs: list):
         """Populate the activity table with log data"""
-        self.activity_table.setRowCount(0)
+        self.activity_model.setLogs(logs)
         
-        for log in logs:
-            row = self.activity_table.rowCount()
-            self.activity_table.insertRow(row)
-            
-            # User
-            user = log.get('username', 'System')
-            self.activity_table.setItem(row, 0, QTableWidgetItem(user))
-            
-            # Action
-            action = log.get('action', 'N/A')
-            self.activity_table.setItem(row, 1, QTableWidgetItem(action))
-            
-            # Target
-            target = log.get('target', 'N/A')
-            self.activity_table.setItem(row, 2, QTableWidgetItem(target))
-            
-            # Time
-            timestamp = log.get('timestamp', '')
-            if timestamp:
-                # Format timestamp nicely
-                try:
-                    dt = datetime.fromisoformat(timestamp)
-                    time_str = dt.strftime("%I:%M %p")
-                except:
-                    time_str = timestamp[:10]
-            else:
-                time_str = 'N/A'
-            self.activity_table.setItem(row, 3, QTableWidgetItem(time_str))
\ No newline at end of file
+        # Fit the columns to the first real data once; later refreshes keep widths
+        if logs and not self._activity_columns_sized:
+            self._activity_columns_sized = True
+            for col in (0, 1, 3):
+                self.activity_table.resizeColumnToContents(col)
@@ -1820,32 +1820,42 @@ class RetailerDashboardWidget(QWidget):
 # =============================================================================
 class BadgeLabel(QLabel):
     """Reusable colored badge for roles, status, stock levels, etc."""
+
+    # Color mapping (consistent across entire app)
+    COLORS = {
+        # Roles
+        "Admin": ("#ffebee", "#c62828"),       # Light red / dark red
+        "Manager": ("#e3f2fd", "#1565c0"),     # Light blue / dark blue
+        "Retailer": ("#e8f5e9", "#2e7d32"),    # Light green / dark green
+
+        # Status
+        "Active": ("#e8f5e9", "#2e7d32"),
+        "Suspended": ("#fff8e1", "#f9a825"),
+        "Inactive": ("#ffebee", "#c62828"),
+
+        # Stock Status
+        "In Stock": ("#e8f5e9", "#2e7d32"),
+        "Low Stock": ("#fff3e0", "#ef6c00"),
+        "No Stock": ("#ffebee", "#c62828"),
+    }
+    DEFAULT_COLORS = ("#f5f5f5", "#333333")
+
+    # Stylesheet per (bg, fg) pair, formatted once
+    _css_cache = {}
+
     def __init__(self, text: str, badge_type: str):
         super().__init__(text)
         self.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.setFixedHeight(28)
         self.setSizePolicy(QSizePolicy.Policy.Fixed, QSizePolicy.Policy.Fixed)
-
-        # Color mapping (consistent across entire app)
-        styles = {
-            # Roles
-            "Admin": ("#ffebee", "#c62828"),       # Light red / dark red
-            "Manager": ("#e3f2fd", "#1565c0"),     # Light blue / dark blue
-            "Retailer": ("#e8f5e9", "#2e7d32"),    # Light green / dark green
-
-            # Status
-            "Active": ("#e8f5e9", "#2e7d32"),
-            "Suspended": ("#fff8e1", "#f9a825"),
-            "Inactive": ("#ffebee", "#c62828"),
-
-            # Stock Status
-            "In Stock": ("#e8f5e9", "#2e7d32"),
-            "Low Stock": ("#fff3e0", "#ef6c00"),
-            "No Stock": ("#ffebee", "#c62828"),
-        }
-
-        bg, fg = styles.get(badge_type, ("#f5f5f5", "#333333"))
-        self.setStyleSheet(f"""
+        self.setStyleSheet(self._stylesheet(self.COLORS.get(badge_type, self.DEFAULT_COLORS)))
+
+    @classmethod
+    def _stylesheet(cls, colors) -> str:
+        css = cls._css_cache.get(colors)
+        if css is None:
+            bg, fg = colors
+            css = cls._css_cache[colors] = f"""
             QLabel {{
                 background-color: {bg};
                 color: {fg};
@@ -1855,7 +1865,8 @@ class BadgeLabel(QLabel):
                 font-size: {AppConfig.FONT_SIZE_NORMAL - 1}pt;
                 min-width: 70px;
             }}
-        """)
+        """
+        return css
 
 
 # =============================================================================
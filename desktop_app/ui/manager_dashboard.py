@@ -5,7 +5,7 @@ Features charts, KPIs, and real-time inventory warnings
 
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QComboBox,
-    QTableWidget, QTableWidgetItem, QFrame, QHeaderView
+    QTableWidget, QFrame, QHeaderView
 )
 from PyQt6.QtCore import Qt, QTimer
 from PyQt6.QtGui import QFont
@@ -18,7 +18,7 @@ from matplotlib.figure import Figure
 from api_client.stockadoodle_api import StockaDoodleAPI
 from utils.config import AppConfig
 from utils.decorators import role_required
-from utils.styles import apply_table_styles
+from utils.styles import apply_table_styles, fill_table
 
 
 class MplCanvas(FigureCanvas):
@@ -343,20 +343,15 @@ class ManagerDashboardWidget(QWidget):
             if resp.success:
                 products = resp.data
                 
-                self.alerts_table.setRowCount(0)
-                
-                for product in products[:20]:  # Limit to 20
-                    row = self.alerts_table.rowCount()
-                    self.alerts_table.insertRow(row)
-                    
-                    self.alerts_table.setItem(row, 0,
-                        QTableWidgetItem(product.get('name', 'N/A')))
-                    self.alerts_table.setItem(row, 1,
-                        QTableWidgetItem(product.get('brand', 'N/A')))
-                    self.alerts_table.setItem(row, 2,
-                        QTableWidgetItem(str(product.get('stock_level', 0))))
-                    self.alerts_table.setItem(row, 3,
-                        QTableWidgetItem(str(product.get('min_stock_level', 0))))
+                fill_table(self.alerts_table, [
+                    (
+                        product.get('name', 'N/A'),
+                        product.get('brand', 'N/A'),
+                        str(product.get('stock_level', 0)),
+                        str(product.get('min_stock_level', 0))
+                    )
+                    for product in products[:20]  # Limit to 20
+                ])
                         
         except Exception as e:
             print(f"Error loading alerts: {e}")
\ No newline at end of file
@@ -15,7 +15,7 @@ from api_client.stockadoodle_api import StockaDoodleAPI
 from utils.config import AppConfig
 from utils.decorators import role_required
 from utils.helpers import get_feather_icon
-from utils.styles import apply_table_styles
+from utils.styles import apply_table_styles, fill_table
 
 
 class RetailerPOSWidget(QWidget):
@@ -330,22 +330,22 @@ class RetailerPOSWidget(QWidget):
         """Filter products based on search input"""
         search_text = self.search_input.text().lower()
         
-        self.products_table.setRowCount(0)
-        
+        rows = []
         for product in self.all_products:
             # Filter logic
             if search_text and search_text not in product.get('name', '').lower():
                 if search_text != str(product.get('id', '')):
                     continue
                     
-            # Add to table
-            row = self.products_table.rowCount()
-            self.products_table.insertRow(row)
-            
-            self.products_table.setItem(row, 0, QTableWidgetItem(str(product['id'])))
-            self.products_table.setItem(row, 1, QTableWidgetItem(product['name']))
-            self.products_table.setItem(row, 2, QTableWidgetItem(f"${product['price']:.2f}"))
-            self.products_table.setItem(row, 3, QTableWidgetItem(str(product.get('stock_level', 0))))
+            rows.append((
+                str(product['id']),
+                product['name'],
+                f"${product['price']:.2f}",
+                str(product.get('stock_level', 0))
+            ))
+        
+        # Runs on every keystroke: fill in one pass rather than row by row
+        fill_table(self.products_table, rows)
             
     def add_selected_to_cart(self):
         """Add the selected product to cart"""
@@ -1,11 +1,19 @@
+from collections import defaultdict
+
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
-                             QLineEdit, QPushButton, QTableWidget, QTableWidgetItem,
-                             QMessageBox, QDialog, QFormLayout, QComboBox, QCheckBox, QToolButton)
-from PyQt6.QtCore import Qt, QSize
+                             QLineEdit, QPushButton, QTableView, QHeaderView,
+                             QMessageBox, QDialog, QFormLayout, QComboBox, QCheckBox, QToolButton,
+                             QStyledItemDelegate)
+from PyQt6.QtCore import Qt, QSize, QRect, QTimer, QEvent, QAbstractTableModel, QModelIndex, pyqtSignal
+from PyQt6.QtGui import QFont, QIcon
 from utils.config import AppConfig
 from utils.decorators import role_required
+from utils.helpers import get_feather_icon
 from utils.style_utils import get_global_stylesheet, apply_table_styles, get_dialog_style
 
+# Pause after the last keystroke before the user list is re-filtered
+SEARCH_DEBOUNCE_MS = 150
+
 # NOTE: The local UserManager and ActivityLogger imports are removed.
 # This class now expects an API client object for user operations.
 
@@ -149,6 +157,113 @@ class UserDialog(QDialog):
         return data
 
 
+class UserTableModel(QAbstractTableModel):
+    """
+    Table model over the user dicts returned by the API
+    Only the cells the view paints are ever asked for
+    """
+    HEADERS = ("ID", "Username", "Role", "Email", "Active", "Created At", "Actions")
+    ACTIONS_COLUMN = 6
+    _CENTERED = frozenset((0, 2, 4, 5))
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._users = []
+
+    def setUsers(self, users: list):
+        """Replace the model contents"""
+        self.beginResetModel()
+        self._users = list(users)
+        self.endResetModel()
+
+    def user(self, row: int) -> dict:
+        return self._users[row]
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._users)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        column = index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            user = self._users[index.row()]
+            if column == 0:
+                return str(user.get('id', ''))
+            if column == 1:
+                return user.get('username', '')
+            if column == 2:
+                return user.get('role', '').capitalize()
+            if column == 3:
+                return user.get('email') or 'N/A'
+            if column == 4:
+                return "Yes" if user.get('is_active') else "No"
+            if column == 5:
+                # Format to YYYY-MM-DD
+                created_at = user.get('created_at') or ''
+                return created_at[:10]
+            return None
+        if role == Qt.ItemDataRole.TextAlignmentRole and column in self._CENTERED:
+            return Qt.AlignmentFlag.AlignCenter
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+
+class UserActionsDelegate(QStyledItemDelegate):
+    """
+    Paints the edit/delete buttons of the Actions column and maps clicks on
+    them back to the row, instead of a button widget per row
+    """
+    editRequested = pyqtSignal(int)
+    deleteRequested = pyqtSignal(int)
+
+    ICONS = ("edit", "trash-2")
+    BUTTON_SIZE = 30
+    ICON_SIZE = 14
+    SPACING = 5
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.enabled = True
+        # Rendered once here; paint() runs for every visible row on every repaint
+        self._icons = [get_feather_icon(name, size=self.ICON_SIZE) for name in self.ICONS]
+
+    def _button_rects(self, cell: QRect):
+        top = cell.top() + (cell.height() - self.BUTTON_SIZE) // 2
+        left = cell.left()
+        for _ in self.ICONS:
+            yield QRect(left, top, self.BUTTON_SIZE, self.BUTTON_SIZE)
+            left += self.BUTTON_SIZE + self.SPACING
+
+    def paint(self, painter, option, index):
+        super().paint(painter, option, index)
+        mode = QIcon.Mode.Normal if self.enabled else QIcon.Mode.Disabled
+        for icon, rect in zip(self._icons, self._button_rects(option.rect)):
+            icon.paint(painter, rect, Qt.AlignmentFlag.AlignCenter, mode)
+
+    def sizeHint(self, option, index):
+        width = len(self.ICONS) * (self.BUTTON_SIZE + self.SPACING)
+        return QSize(width, self.BUTTON_SIZE)
+
+    def editorEvent(self, event, model, option, index):
+        if (self.enabled and event.type() == QEvent.Type.MouseButtonRelease
+                and event.button() == Qt.MouseButton.LeftButton):
+            pos = event.position().toPoint()
+            signals = (self.editRequested, self.deleteRequested)
+            for signal, rect in zip(signals, self._button_rects(option.rect)):
+                if rect.contains(pos):
+                    signal.emit(index.row())
+                    return True
+        return super().editorEvent(event, model, option, index)
+
+
 class UserManagementWidget(QWidget):
     def __init__(self, current_user, user_client, parent=None):
         super().__init__(parent)
@@ -189,7 +304,12 @@ class UserManagementWidget(QWidget):
         search_filter_layout = QHBoxLayout()
         self.search_input = QLineEdit()
         self.search_input.setPlaceholderText("Search users by username or role...")
-        self.search_input.textChanged.connect(self.filter_users)
+        # Filter once the user pauses typing rather than on every keystroke
+        self._filter_timer = QTimer(self)
+        self._filter_timer.setSingleShot(True)
+        self._filter_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self._filter_timer.timeout.connect(self.filter_users)
+        self.search_input.textChanged.connect(lambda _text: self._filter_timer.start())
         search_filter_layout.addWidget(self.search_input)
 
         self.role_filter_combo = QComboBox()
@@ -202,10 +322,19 @@ class UserManagementWidget(QWidget):
         search_filter_layout.addWidget(self.add_refresh_button())
         main_layout.addLayout(search_filter_layout)
 
-        # User Table
-        self.user_table = QTableWidget()
-        self.user_table.setColumnCount(7) # ID, Username, Role, Email, Active, Created, Actions
-        self.user_table.setHorizontalHeaderLabels(["ID", "Username", "Role", "Email", "Active", "Created At", "Actions"])
+        # User Table - model/view, so rows cost nothing until painted
+        self.user_table = QTableView()
+        self.user_model = UserTableModel(self)
+        self.user_table.setModel(self.user_model)
+        self.user_table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+        self.user_table.setEditTriggers(QTableView.EditTrigger.NoEditTriggers)
+
+        self.actions_delegate = UserActionsDelegate(self.user_table)
+        self.actions_delegate.editRequested.connect(lambda row: self.edit_user(self.user_model.user(row)))
+        self.actions_delegate.deleteRequested.connect(lambda row: self.delete_user(self.user_model.user(row)))
+        self.user_table.setItemDelegateForColumn(UserTableModel.ACTIONS_COLUMN, self.actions_delegate)
+        self._columns_sized = False
+
         apply_table_styles(self.user_table)
         main_layout.addWidget(self.user_table)
 
@@ -234,90 +363,60 @@ class UserManagementWidget(QWidget):
         response = self.user_client.list()
         
         self.all_users = [] # Store all users for filtering
-        self.user_table.setRowCount(0)
+        self._search_keys = []
+        self._by_role = {}
+        self.user_model.setUsers([])
 
         if response.success:
             self.all_users = response.data
+            self._build_search_index()
             self.filter_users() # Call filter to populate the table
         else:
             QMessageBox.critical(self, "API Error", f"Failed to load users: {response.message}")
 
+    def _build_search_index(self):
+        """Lower-case the searchable fields once per load instead of once per filter pass."""
+        # NUL separator: a typed search can never match across username and role
+        self._search_keys = [
+            f"{user.get('username', '')}\0{user.get('role', '')}".lower()
+            for user in self.all_users
+        ]
+        by_role = defaultdict(list)
+        for idx, user in enumerate(self.all_users):
+            by_role[user.get('role', '').lower()].append(idx)
+        self._by_role = dict(by_role)
+
     def filter_users(self):
         """Filters the list of users based on search and role filters."""
+        # Role changes and reloads filter immediately; drop any pending keystroke pass
+        self._filter_timer.stop()
         search_text = self.search_input.text().lower()
         selected_role = self.role_filter_combo.currentData()
 
-        filtered_users = []
-        for user in self.all_users:
-            username = user.get('username', '').lower()
-            role = user.get('role', '').lower()
-            
-            matches_search = search_text in username or search_text in role
-            matches_role = (selected_role is None) or (role == selected_role)
+        if selected_role is None:
+            candidates = range(len(self.all_users))
+        else:
+            candidates = self._by_role.get(selected_role, ())
 
-            if matches_search and matches_role:
-                filtered_users.append(user)
+        keys = self._search_keys
+        if search_text:
+            indices = [i for i in candidates if search_text in keys[i]]
+        else:
+            indices = candidates
 
-        self.display_users(filtered_users)
+        all_users = self.all_users
+        self.display_users([all_users[i] for i in indices])
 
     def display_users(self, users):
         """Populates the table with the provided list of user data."""
-        self.user_table.setRowCount(len(users))
-        for row, user in enumerate(users):
-            # 0. ID (hidden but useful for data reference)
-            id_item = QTableWidgetItem(str(user.get('id', '')))
-            id_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.user_table.setItem(row, 0, id_item)
-
-            # 1. Username
-            username_item = QTableWidgetItem(user.get('username', ''))
-            self.user_table.setItem(row, 1, username_item)
-
-            # 2. Role
-            role_item = QTableWidgetItem(user.get('role', '').capitalize())
-            role_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.user_table.setItem(row, 2, role_item)
-            
-            # 3. Email
-            email_item = QTableWidgetItem(user.get('email', 'N/A'))
-            self.user_table.setItem(row, 3, email_item)
-
-            # 4. Active Status
-            active_item = QTableWidgetItem("Yes" if user.get('is_active') else "No")
-            active_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.user_table.setItem(row, 4, active_item)
-            
-            # 5. Created At (Format to YYYY-MM-DD)
-            created_at = user.get('created_at', '')
-            date_str = created_at[:10] if created_at and len(created_at) >= 10 else created_at
-            created_item = QTableWidgetItem(date_str)
-            created_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.user_table.setItem(row, 5, created_item)
-
-            # 6. Actions (Buttons)
-            action_widget = QWidget()
-            action_layout = QHBoxLayout(action_widget)
-            action_layout.setContentsMargins(0, 0, 0, 0)
-            action_layout.setSpacing(5)
-
-            edit_btn = QPushButton()
-            edit_btn.setIcon(get_feather_icon("edit", size=14))
-            edit_btn.setFixedSize(QSize(30, 30))
-            edit_btn.clicked.connect(lambda _, u=user: self.edit_user(u))
-            action_layout.addWidget(edit_btn)
-
-            delete_btn = QPushButton()
-            delete_btn.setIcon(get_feather_icon("trash-2", size=14))
-            delete_btn.setFixedSize(QSize(30, 30))
-            delete_btn.clicked.connect(lambda _, u=user: self.delete_user(u))
-            action_layout.addWidget(delete_btn)
-            
-            action_layout.addStretch()
-
-            self.user_table.setCellWidget(row, 6, action_widget)
+        self.user_model.setUsers(users)
 
-        self.user_table.resizeColumnsToContents()
-        self.user_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
+        # Size columns from the first real data set only; later refreshes and
+        # filter passes keep the widths instead of re-measuring every row
+        if users and not self._columns_sized:
+            self._columns_sized = True
+            self.user_table.resizeColumnsToContents()
+            self.user_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
 
 
     @role_required(["admin"])
@@ -388,11 +487,8 @@ class UserManagementWidget(QWidget):
         self.add_user_btn.setVisible(is_admin)
 
         # Disable action buttons in the table for non-admins
-        for row in range(self.user_table.rowCount()):
-            widget = self.user_table.cellWidget(row, 6)
-            if widget:
-                for btn in widget.findChildren(QPushButton):
-                    btn.setEnabled(is_admin)
+        self.actions_delegate.enabled = is_admin
+        self.user_table.viewport().update()
 
         if not is_admin:
             QMessageBox.information(self, "Permission Notice", 
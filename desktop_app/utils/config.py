@@ -141,6 +141,15 @@ class UserSession:
         timeout = timedelta(minutes=AppConfig.SESSION_TIMEOUT_MINUTES)
         return (datetime.now() - self._last_activity) > timeout
     
+    def seconds_until_expiry(self) -> float:
+        """Seconds of inactivity left before the session expires (0 if expired)"""
+        if not self._last_activity:
+            return 0.0
+        
+        from datetime import timedelta
+        expires_at = self._last_activity + timedelta(minutes=AppConfig.SESSION_TIMEOUT_MINUTES)
+        return max(0.0, (expires_at - datetime.now()).total_seconds())
+    
     @property
     def user_id(self) -> Optional[int]:
         return self._user_id
@@ -224,11 +224,11 @@ def cache_result(timeout_seconds: int = 300):
             # Check if cached result exists and is still valid
             if cache_key in cache:
                 if time.time() - cache_time[cache_key] < timeout_seconds:
-                    logger.debug(f"Cache hit for {func.__name__}")
+                    logger.debug("Cache hit for %s", func.__name__)
                     return cache[cache_key]
             
             # Execute function and cache result
-            logger.debug(f"Cache miss for {func.__name__}")
+            logger.debug("Cache miss for %s", func.__name__)
             result = func(*args, **kwargs)
             cache[cache_key] = result
             cache_time[cache_key] = time.time()
@@ -3,14 +3,18 @@ Unified Styling System for StockaDoodle Desktop App
 Provides consistent theming, QSS stylesheets, and helper functions
 """
 
-from PyQt6.QtWidgets import QTableWidget, QMessageBox
+from functools import lru_cache
+
+from PyQt6.QtWidgets import QTableView, QTableWidget, QTableWidgetItem, QMessageBox
 from utils.config import AppConfig
 
 
+@lru_cache(maxsize=1)
 def get_global_stylesheet() -> str:
     """
     Get the global application stylesheet
     Apply to QApplication or main window
+    Built once: every window applies it, and AppConfig's theme values are constants
     """
     return f"""
         /* Global Styles */
@@ -258,15 +262,15 @@ def get_global_stylesheet() -> str:
     """
 
 
-def apply_table_styles(table: QTableWidget):
+def apply_table_styles(table: QTableView):
     """
-    Apply consistent styling to QTableWidget
+    Apply consistent styling to a QTableWidget or model-backed QTableView
     
     Args:
-        table: QTableWidget instance to style
+        table: QTableView (or QTableWidget) instance to style
     """
     table.setStyleSheet(f"""
-        QTableWidget {{
+        QTableView {{
             background-color: {AppConfig.CARD_BACKGROUND};
             color: {AppConfig.TEXT_COLOR};
             gridline-color: #444;
@@ -274,17 +278,17 @@ def apply_table_styles(table: QTableWidget):
             border-radius: 8px;
         }}
         
-        QTableWidget::item {{
+        QTableView::item {{
             padding: 8px;
             border: none;
         }}
         
-        QTableWidget::item:selected {{
+        QTableView::item:selected {{
             background-color: {AppConfig.PRIMARY_COLOR};
             color: white;
         }}
         
-        QTableWidget::item:hover {{
+        QTableView::item:hover {{
             background-color: rgba(108, 92, 231, 0.3);
         }}
         
@@ -315,6 +319,34 @@ def apply_table_styles(table: QTableWidget):
     table.setShowGrid(True)
 
 
+def fill_table(table: QTableWidget, rows: list):
+    """
+    Replace a QTableWidget's contents with rows of cell texts in one pass
+    
+    Painting, sorting and signals are suspended for the fill, and the row count
+    is set once rather than growing the table with insertRow() per row
+    
+    Args:
+        table: QTableWidget to fill
+        rows: Sequence of rows, each a sequence of cell strings
+    """
+    sorting = table.isSortingEnabled()
+    table.setUpdatesEnabled(False)
+    table.setSortingEnabled(False)
+    table.blockSignals(True)
+    try:
+        table.clearContents()
+        table.setRowCount(len(rows))
+        for row, cells in enumerate(rows):
+            for col, text in enumerate(cells):
+                table.setItem(row, col, QTableWidgetItem(text))
+    finally:
+        table.blockSignals(False)
+        table.setSortingEnabled(sorting)
+        table.setUpdatesEnabled(True)
+    table.viewport().update()
+
+
 def get_dashboard_card_style(color: str = None) -> str:
     """
     Get stylesheet for dashboard cards